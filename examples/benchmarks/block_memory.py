@@ -0,0 +1,93 @@
+"""
+Benchmark: memory held per block in large generated flows.
+
+Builds flows with the menu sections from layout_scaling.py (prompts, menus
+with conditions, a shared disconnect) and reports the bytes allocated per
+block while the flow is held in memory, before and after compiling it.
+
+With --baseline, the same flows are also built with the src/ tree of a git
+revision (e.g. the commit before blocks became slotted dataclasses), in a
+subprocess, and both are reported side by side.
+
+Usage: python block_memory.py [--baseline GIT_REF] [--sizes N ...]
+"""
+import argparse
+import gc
+import subprocess
+import sys
+import tarfile
+import tempfile
+import tracemalloc
+from io import BytesIO
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent.parent
+
+
+def measure(num_blocks: int):
+    """Bytes per block for a built flow, then for the same flow once compiled."""
+    from layout_scaling import build_flow
+
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    flow = build_flow(num_blocks)
+    built = tracemalloc.get_traced_memory()[0] - baseline
+    compiled_json = flow.compile()
+    del compiled_json
+    gc.collect()
+    compiled = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return len(flow.blocks), built, compiled
+
+
+def measure_revision(ref: str, sizes):
+    """measure() for each size, run against src/ as of a git revision."""
+    archive = subprocess.run(["git", "-C", str(ROOT), "archive", ref, "src"],
+                             check=True, capture_output=True).stdout
+    with tempfile.TemporaryDirectory() as directory:
+        with tarfile.open(fileobj=BytesIO(archive)) as tar:
+            tar.extractall(directory)
+        output = subprocess.run(
+            [sys.executable, __file__, "--src", str(Path(directory) / "src"), "--raw",
+             "--sizes", *map(str, sizes)],
+            check=True, capture_output=True, text=True).stdout
+    return [tuple(int(value) for value in line.split()) for line in output.splitlines()]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--baseline", help="Git revision to compare against")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--src", default=str(ROOT / "src"), help=argparse.SUPPRESS)
+    parser.add_argument("--raw", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # Imported first, so layout_scaling's own path entry does not replace it
+    sys.path.insert(0, args.src)
+    import flow_builder  # noqa: F401
+
+    results = [measure(size) for size in args.sizes]
+    if args.raw:
+        for count, built, compiled in results:
+            print(count, built, compiled)
+        return
+
+    if args.baseline is None:
+        print(f"{'Blocks':>8} {'Built (B/block)':>16} {'Compiled (B/block)':>19}")
+        print("-" * 45)
+        for count, built, compiled in results:
+            print(f"{count:>8} {built / count:>16.0f} {compiled / count:>19.0f}")
+        return
+
+    before = measure_revision(args.baseline, args.sizes)
+    print(f"Bytes per block, {args.baseline} -> working tree")
+    print(f"{'Blocks':>8} {'Built before':>13} {'Built after':>12} {'Compiled before':>16} {'Compiled after':>15}")
+    print("-" * 68)
+    for (count, built, compiled), (old_count, old_built, old_compiled) in zip(results, before):
+        print(f"{count:>8} {old_built / old_count:>13.0f} {built / count:>12.0f} "
+              f"{old_compiled / old_count:>16.0f} {compiled / count:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Check: cached compiles match uncached compiles after random edits.
+
+For each seed, builds a random flow with cache_compile=True and applies a
+sequence of edits: rewiring, error branches, new and removed blocks, field
+assignments and in-place edits of nested typed fields (media, input
+validation, DTMF settings). After every edit, compile_to_json() must equal
+the JSON of an uncached compile. Exits 1 on the first mismatch.
+
+Usage: python compile_cache_check.py [--seeds N] [--edits N]
+"""
+import argparse
+import json
+import random
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from flow_builder import ContactFlowBuilder
+from blocks.types import CustomValidation, DTMFConfiguration, InputValidation, Media
+
+
+def uncached_json(flow: ContactFlowBuilder) -> str:
+    """compile_to_json() of the flow with the cache bypassed."""
+    flow.cache_compile = False
+    try:
+        return json.dumps(flow.compile(), indent=2)
+    finally:
+        flow.cache_compile = True
+
+
+def edit_fields(rng: random.Random, block):
+    """Assign a typed field or edit a nested typed field in place."""
+    choice = rng.random()
+    value = str(rng.randrange(100))
+    if hasattr(block, "input_time_limit_seconds"):
+        if choice < 0.25:
+            block.input_time_limit_seconds = value
+        elif choice < 0.5:
+            if block.input_validation is None:
+                block.input_validation = InputValidation(custom_validation=CustomValidation(maximum_length="5"))
+            else:
+                block.input_validation.custom_validation.maximum_length = value
+        elif choice < 0.75:
+            if block.dtmf_configuration is None:
+                block.dtmf_configuration = DTMFConfiguration()
+            block.dtmf_configuration.input_termination_sequence = value
+        else:
+            block.text = f"Menu {value}"
+    elif choice < 0.5:
+        if block.media is None:
+            block.media = Media(uri=f"s3://prompts/{value}.wav")
+        else:
+            block.media.uri = f"s3://prompts/{value}.wav"
+    else:
+        block.text = f"Prompt {value}"
+
+
+def check_seed(seed: int, edits: int) -> bool:
+    rng = random.Random(seed)
+    flow = ContactFlowBuilder(f"Cache {seed}", cache_compile=True, id_generator="counter")
+    blocks = []
+
+    def new_block():
+        block = flow.get_input("Menu") if rng.random() < 0.4 else flow.play_prompt("Prompt")
+        blocks.append(block)
+        return block
+
+    for _ in range(rng.randrange(3, 40)):
+        new_block()
+    for i, block in enumerate(blocks[:-1]):
+        block.then(blocks[i + 1])
+
+    for step in range(edits):
+        if flow.compile_to_json() != uncached_json(flow):
+            print(f"Mismatch: seed {seed}, after {step} edits")
+            return False
+
+        choice = rng.random()
+        block = rng.choice(blocks)
+        if choice < 0.2:
+            block.then(rng.choice(blocks))
+        elif choice < 0.3:
+            block.on_error("NoMatchingError", rng.choice(blocks))
+        elif choice < 0.4:
+            new_block().then(rng.choice(blocks))
+        elif choice < 0.5 and len(blocks) > 3:
+            removed = rng.choice(blocks[1:])
+            flow.remove(removed)
+            blocks.remove(removed)
+        else:
+            edit_fields(rng, block)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seeds", type=int, default=300)
+    parser.add_argument("--edits", type=int, default=25)
+    args = parser.parse_args()
+
+    failed = sum(not check_seed(seed, args.edits) for seed in range(args.seeds))
+    print(f"{args.seeds - failed} of {args.seeds} edit sequences match an uncached compile")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
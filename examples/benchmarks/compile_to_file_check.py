@@ -0,0 +1,95 @@
+"""
+Check: compile_to_file() writes exactly what compile_to_json() returns.
+
+For each seed, builds a random flow whose blocks mix ASCII and non-ASCII
+prompt text with attribute values that each JSON backend could spell
+differently (floats from 1e-5 to 1e-4, exponent-form and large floats,
+big integers), so some actions would fall back to the stdlib and others
+not. The flow is written with and without cache_compile and a manifest,
+under every JSON backend, and each file must equal compile_to_json().
+Exits 1 on the first mismatch.
+
+Usage: python compile_to_file_check.py [--seeds N]
+"""
+import argparse
+import random
+import sys
+import tempfile
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+import json_backend
+from flow_builder import ContactFlowBuilder
+from flow_manifest import FlowManifest
+
+TEXTS = ["hello", "héllo", "Press 1 ☎", "plain text", 'quote " and \\ backslash']
+
+
+def attribute_value(rng: random.Random):
+    return rng.choice([
+        rng.uniform(1e-5, 1e-4),
+        rng.random() * 10 ** rng.uniform(-30, 30),
+        rng.randrange(10 ** 20, 10 ** 25),
+        rng.randrange(100),
+        "2.5e-05",
+    ])
+
+
+def mixed_flow() -> ContactFlowBuilder:
+    """A non-ASCII prompt next to a small float, which used to be written as 0.000025."""
+    flow = ContactFlowBuilder("Mixed", id_generator="counter")
+    prompt = flow.play_prompt("héllo")
+    attributes = flow.update_attributes(b=2.5e-05)
+    prompt.then(attributes)
+    attributes.then(flow.disconnect())
+    return flow
+
+
+def random_flow(rng: random.Random) -> ContactFlowBuilder:
+    flow = ContactFlowBuilder(f"Random {rng.random()}", id_generator="counter")
+    blocks = []
+    for _ in range(rng.randrange(1, 12)):
+        if rng.random() < 0.5:
+            blocks.append(flow.play_prompt(rng.choice(TEXTS)))
+        else:
+            blocks.append(flow.update_attributes(**{f"a{i}": attribute_value(rng) for i in range(rng.randrange(1, 4))}))
+    for block, next_block in zip(blocks, blocks[1:]):
+        block.then(next_block)
+    blocks[-1].then(flow.disconnect())
+    return flow
+
+
+def check_flow(flow: ContactFlowBuilder, directory: Path) -> bool:
+    expected = flow.compile_to_json()
+    for cache_compile in (False, True):
+        for manifest in (None, FlowManifest()):
+            flow.cache_compile = cache_compile
+            path = directory / f"{cache_compile}_{manifest is not None}.json"
+            flow.compile_to_file(str(path), manifest=manifest)
+            if path.read_text() != expected:
+                return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seeds", type=int, default=200)
+    args = parser.parse_args()
+
+    failed = 0
+    with tempfile.TemporaryDirectory() as directory:
+        for name in json_backend.JSON_BACKENDS:
+            json_backend.set_backend(name)
+            flows = [mixed_flow()] + [random_flow(random.Random(seed)) for seed in range(args.seeds)]
+            backend_failed = 0
+            for i, flow in enumerate(flows):
+                if not check_flow(flow, Path(directory)):
+                    backend_failed += 1
+                    print(f"{name}: flow {i} file differs from compile_to_json()")
+            print(f"{name:>8}: {len(flows) - backend_failed} of {len(flows)} files match compile_to_json()")
+            failed += backend_failed
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
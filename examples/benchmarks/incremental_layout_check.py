@@ -0,0 +1,86 @@
+"""
+Check: incremental layout matches a full layout after random edits.
+
+For each seed, builds a random flow with incremental_layout=True and
+applies a sequence of edits (rewiring, error branches, new blocks,
+removals, conditions). After every edit the incremental compile's
+Metadata must equal a full layout of the same blocks. Exits 1 on the
+first mismatch.
+
+Usage: python incremental_layout_check.py [--seeds N] [--edits N]
+"""
+import argparse
+import random
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from flow_builder import ContactFlowBuilder
+
+
+def full_layout(flow: ContactFlowBuilder) -> dict:
+    """Metadata of a full (non-incremental) layout, leaving the incremental state intact."""
+    state = flow._layout_state
+    flow.incremental_layout = False
+    try:
+        return flow.compile()["Metadata"]
+    finally:
+        flow.incremental_layout = True
+        flow._layout_state = state
+
+
+def check_seed(seed: int, edits: int) -> bool:
+    rng = random.Random(seed)
+    flow = ContactFlowBuilder(f"Incremental {seed}", incremental_layout=True, id_generator="counter")
+    blocks = []
+
+    def new_block():
+        block = flow.get_input("Menu") if rng.random() < 0.4 else flow.play_prompt("Prompt")
+        blocks.append(block)
+        return block
+
+    for _ in range(rng.randrange(3, 60)):
+        new_block()
+    for i, block in enumerate(blocks):
+        if rng.random() < 0.85 and i + 1 < len(blocks):
+            block.then(blocks[min(len(blocks) - 1, i + 1 + rng.randrange(3))])
+        if hasattr(block, "when"):
+            for _ in range(rng.randrange(3)):
+                block.when("1", rng.choice(blocks))
+
+    for step in range(edits):
+        if flow.compile()["Metadata"] != full_layout(flow):
+            print(f"Mismatch: seed {seed}, after {step} edits")
+            return False
+
+        choice = rng.random()
+        block = rng.choice(blocks)
+        if choice < 0.3:
+            block.then(rng.choice(blocks))
+        elif choice < 0.5:
+            block.on_error("NoMatchingError", rng.choice(blocks))
+        elif choice < 0.7:
+            new_block().then(rng.choice(blocks))
+            rng.choice(blocks).then(blocks[-1])
+        elif choice < 0.8 and len(blocks) > 3:
+            removed = rng.choice(blocks[1:])
+            flow.remove(removed)
+            blocks.remove(removed)
+        elif hasattr(block, "when"):
+            block.when("2", rng.choice(blocks))
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seeds", type=int, default=400)
+    parser.add_argument("--edits", type=int, default=25)
+    args = parser.parse_args()
+
+    failed = sum(not check_seed(seed, args.edits) for seed in range(args.seeds))
+    print(f"{args.seeds - failed} of {args.seeds} edit sequences match a full layout")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark: JSON parse/emit time per JSON backend on a flow corpus.
+
+Parses every flow JSON file in the given directories (default: input/),
+then pretty-prints it and runs a full decompile -> to_json round trip, with
+each available backend. Also checks that every backend's output is
+byte-identical to the stdlib's.
+
+Usage: python json_backend.py [flow_dir ...] [--repeat N]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+import json_backend
+from decompiler import FlowDecompiler
+
+
+def load_corpus(directories):
+    """Raw text of every *.json file in the directories."""
+    texts = []
+    for directory in directories:
+        for path in sorted(Path(directory).glob("*.json")):
+            texts.append(path.read_text())
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("directories", nargs="*",
+                        default=[str(Path(__file__).parent.parent.parent / "input")])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    texts = load_corpus(args.directories)
+    megabytes = sum(len(text) for text in texts) / 1e6
+    print(f"{len(texts)} flows, {megabytes:.1f} MB, x{args.repeat}")
+
+    reference = None
+    print(f"{'Backend':>8} {'Parse (s)':>10} {'Emit (s)':>10} {'Round trip (s)':>15} {'Identical':>10}")
+    print("-" * 57)
+    for name in json_backend.JSON_BACKENDS:
+        json_backend.set_backend(name)
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            flows = [json_backend.loads(text) for text in texts]
+        parse = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            output = [json_backend.dumps(flow, indent=2) for flow in flows]
+        emit = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for text in texts:
+                flow, _ = FlowDecompiler.decompile(json_backend.loads(text))
+                flow.to_json()
+        round_trip = time.perf_counter() - start
+
+        if reference is None:
+            reference = output
+        print(f"{name:>8} {parse:>10.3f} {emit:>10.3f} {round_trip:>15.3f} {str(output == reference):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Check: every JSON backend writes and reads exactly what the stdlib does.
+
+For each seed, builds a random JSON-like value (floats from 1e-30 to 1e30,
+including the 1e-5..1e-4 range orjson writes positionally, -0.0, NaN and
+Infinity, integers beyond 64 bits, non-ASCII and escaped strings) and
+compares dumps(indent=2), dumps() and canonical_dumps() of each backend
+with json.dumps, and loads() of the output with json.loads. Values json.dumps
+rejects (UUIDs, enums, dataclasses, datetimes) must raise TypeError on every
+backend. Exits 1 on the first mismatch.
+
+Usage: python json_backend_check.py [--seeds N]
+"""
+import argparse
+import datetime
+import enum
+import json
+import random
+import sys
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+import json_backend
+
+
+class Color(enum.Enum):
+    RED = "red"
+
+
+@dataclass
+class Point:
+    x: int
+
+
+UNSUPPORTED = [uuid.UUID(int=7), Color.RED, Point(1), datetime.datetime(2024, 1, 1), datetime.date(2024, 1, 1)]
+
+
+def random_float(rng: random.Random) -> float:
+    choice = rng.random()
+    if choice < 0.05:
+        return rng.choice([0.0, -0.0, float("nan"), float("inf"), -float("inf"), 5e-324, 1e-4, 1e16])
+    if choice < 0.35:
+        return rng.uniform(1e-5, 1e-4) * rng.choice([1, -1])  # Positional in orjson, exponent in repr
+    return rng.random() * 10 ** rng.uniform(-30, 30) * rng.choice([1, -1])
+
+
+def random_scalar(rng: random.Random):
+    choice = rng.random()
+    if choice < 0.4:
+        return random_float(rng)
+    if choice < 0.6:
+        return rng.choice([rng.randrange(-10 ** 6, 10 ** 6), rng.randrange(-10 ** 25, 10 ** 25)])
+    if choice < 0.7:
+        return rng.choice([True, False, None])
+    return "".join(rng.choice(["a", "Z", " ", "1e-05", '"', "\\", "\n", "\x7f", "é", "☃", "\U0001f600"])
+                   for _ in range(rng.randrange(6)))
+
+
+def random_value(rng: random.Random, depth: int = 0):
+    choice = rng.random()
+    if depth < 4 and choice < 0.3:
+        return {f"k{rng.randrange(20)}": random_value(rng, depth + 1) for _ in range(rng.randrange(5))}
+    if depth < 4 and choice < 0.5:
+        return [random_value(rng, depth + 1) for _ in range(rng.randrange(5))]
+    return random_scalar(rng)
+
+
+def check_value(value) -> bool:
+    expected = [json.dumps(value, indent=2), json.dumps(value),
+                json.dumps(value, sort_keys=True, separators=(",", ":"))]
+    actual = [json_backend.dumps(value, indent=2), json_backend.dumps(value), json_backend.canonical_dumps(value)]
+    if actual != expected:
+        return False
+    return repr(json_backend.loads(expected[0])) == repr(json.loads(expected[0]))
+
+
+def check_unsupported() -> bool:
+    for value in UNSUPPORTED:
+        for wrapped in (value, {"a": [1.5, value]}):
+            for encode in (lambda v: json_backend.dumps(v, indent=2), json_backend.canonical_dumps):
+                try:
+                    encode(wrapped)
+                except TypeError:
+                    continue
+                print(f"{type(value).__name__} was encoded instead of raising TypeError")
+                return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seeds", type=int, default=2000)
+    args = parser.parse_args()
+
+    failed = 0
+    for name in json_backend.JSON_BACKENDS:
+        json_backend.set_backend(name)
+        backend_failed = 0
+        for seed in range(args.seeds):
+            if not check_value(random_value(random.Random(seed))):
+                backend_failed += 1
+                print(f"{name}: seed {seed} differs from the stdlib")
+        if not check_unsupported():
+            backend_failed += 1
+        print(f"{name:>8}: {args.seeds - backend_failed} of {args.seeds} values match the stdlib")
+        failed += backend_failed
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark: edge crossings and layout time per layout engine.
+
+Lays out the menu-section flows from layout_scaling.py and randomly wired
+menu trees (menus whose options jump to random later blocks) with each
+engine, reporting forward-edge crossings, the number of columns and wall
+time for the level and row assignment. The random flows jump back to
+earlier menus, so cycle-aware engines lay out a different skeleton.
+"""
+import random
+import sys
+import time
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from flow_builder import ContactFlowBuilder
+from flow_graph import FlowGraph
+from layout import LayeredBFSLayout, SugiyamaLayout, count_crossings
+from layout_scaling import build_flow
+
+
+def build_random_flow(num_blocks: int, seed: int = 0) -> ContactFlowBuilder:
+    """Menus whose options point at random blocks further down the flow."""
+    rng = random.Random(seed)
+    flow = ContactFlowBuilder(f"Random {num_blocks}")
+    blocks = [flow.play_prompt("Welcome")]
+    while len(blocks) < num_blocks:
+        blocks.append(flow.get_input("Choose", timeout=5) if rng.random() < 0.3 else flow.play_prompt("Info"))
+    disconnect = flow.disconnect()
+
+    for i, block in enumerate(blocks):
+        later = blocks[i + 1:i + 50] or [disconnect]
+        if block.type == "GetParticipantInput" and i > 0:
+            # Retry loop back to an earlier block
+            block.on_error("InputTimeLimitExceeded", rng.choice(blocks[max(0, i - 20):i]))
+        if block.type == "GetParticipantInput":
+            for digit in "123":
+                block.when(digit, rng.choice(later))
+            block.otherwise(rng.choice(later)).on_error("NoMatchingError", disconnect)
+        else:
+            block.then(rng.choice(later))
+    return flow
+
+
+def main():
+    engines = {
+        "bfs": LayeredBFSLayout(),
+        "bfs-cycle-aware": LayeredBFSLayout(cycle_aware=True),
+        "sugiyama": SugiyamaLayout(),
+        "sugiyama-median": SugiyamaLayout(method="median"),
+    }
+    flows = [("menu", build_flow), ("random", build_random_flow)]
+    sizes = [100, 1_000, 10_000]
+
+    print(f"{'Flow':>8} {'Blocks':>7} {'Engine':>16} {'Crossings':>10} {'Columns':>8} {'Time (s)':>9}")
+    print("-" * 63)
+    for flow_name, builder in flows:
+        for size in sizes:
+            flow = builder(size)
+            for engine_name, engine in engines.items():
+                graph = FlowGraph(flow.blocks, flow.blocks[0].identifier)
+                start = time.perf_counter()
+                levels = engine.assign_levels(graph)
+                rows = engine.assign_rows(graph, levels)
+                elapsed = time.perf_counter() - start
+                crossings = count_crossings(graph, levels, rows)
+                columns = max(levels.values()) + 1
+                print(f"{flow_name:>8} {len(flow.blocks):>7} {engine_name:>16} {crossings:>10} {columns:>8} {elapsed:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Benchmark: ContactFlowBuilder compile time vs. block count.
+
+Builds flows made of repeated menu sections (prompt -> menu -> two options)
+and reports compile time per block, which should stay flat as flows grow.
+"""
+import sys
+import time
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from flow_builder import ContactFlowBuilder
+
+
+def build_flow(num_blocks: int) -> ContactFlowBuilder:
+    """Build a flow of chained menu sections with roughly num_blocks blocks."""
+    flow = ContactFlowBuilder(f"Scaling {num_blocks}")
+    previous = flow.play_prompt("Welcome")
+    disconnect = flow.disconnect()
+
+    while len(flow.blocks) + 4 <= num_blocks:
+        menu = flow.get_input("Press 1 or 2", timeout=5)
+        option1 = flow.play_prompt("Option 1")
+        option2 = flow.play_prompt("Option 2")
+        prompt = flow.play_prompt("Next section")
+
+        previous.then(menu)
+        menu.when("1", option1) \
+            .when("2", option2) \
+            .otherwise(prompt) \
+            .on_error("NoMatchingError", disconnect)
+        option1.then(prompt)
+        option2.then(prompt)
+        previous = prompt
+
+    previous.then(disconnect)
+    return flow
+
+
+def main():
+    sizes = [10, 100, 1_000, 10_000, 50_000]
+
+    print(f"{'Blocks':>8} {'Compile (s)':>12} {'us/block':>10}")
+    print("-" * 32)
+    for size in sizes:
+        flow = build_flow(size)
+        start = time.perf_counter()
+        flow.compile()
+        elapsed = time.perf_counter() - start
+        print(f"{len(flow.blocks):>8} {elapsed:>12.4f} {elapsed / len(flow.blocks) * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Check: every block is positioned, including blocks unreachable from start.
+
+Compiles random flows with orphaned blocks and cycles among them under
+each layout engine (including the cycle-aware ones) and checks that every
+block gets a position and no two blocks share one. Exits 1 on the first
+failure.
+
+Usage: python unreachable_layout_check.py [--seeds N]
+"""
+import argparse
+import random
+import sys
+import traceback
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from flow_builder import ContactFlowBuilder
+from layout import LayeredBFSLayout, SugiyamaLayout
+
+ENGINES = {
+    "bfs": LayeredBFSLayout,
+    "bfs-cycle-aware": lambda: LayeredBFSLayout(cycle_aware=True),
+    "sugiyama": SugiyamaLayout,
+}
+
+
+def orphan_cycle_flow(engine) -> ContactFlowBuilder:
+    """start -> end, plus orphans A <-> B and D -> B, with A registered before D."""
+    flow = ContactFlowBuilder("Orphan cycle", layout_engine=engine, id_generator="counter")
+    start = flow.play_prompt("Start")
+    start.then(flow.disconnect())
+    a = flow.play_prompt("A")
+    b = flow.play_prompt("B")
+    d = flow.play_prompt("D")
+    a.then(b)
+    b.then(a)
+    d.then(b)
+    return flow
+
+
+def random_flow(rng: random.Random, engine) -> ContactFlowBuilder:
+    """Random wiring where some blocks end up unreachable from the start block."""
+    flow = ContactFlowBuilder("Random", layout_engine=engine, id_generator="counter")
+    blocks = [flow.get_input("Menu") if rng.random() < 0.3 else flow.play_prompt("Prompt")
+              for _ in range(rng.randrange(2, 40))]
+    for block in blocks:
+        if rng.random() < 0.6:
+            block.then(rng.choice(blocks))
+        if hasattr(block, "when") and rng.random() < 0.5:
+            block.when("1", rng.choice(blocks))
+    return flow
+
+
+def check(flow: ContactFlowBuilder) -> bool:
+    positions = flow.compile()["Metadata"]["ActionMetadata"]
+    points = {(entry["position"]["x"], entry["position"]["y"]) for entry in positions.values()}
+    return len(positions) == len(flow.blocks) and len(points) == len(positions)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seeds", type=int, default=300)
+    args = parser.parse_args()
+
+    failed = 0
+    for name, engine in ENGINES.items():
+        flows = [orphan_cycle_flow(engine())]
+        flows += [random_flow(random.Random(seed), engine()) for seed in range(args.seeds)]
+        engine_failed = 0
+        for i, flow in enumerate(flows):
+            try:
+                ok = check(flow)
+            except Exception:
+                traceback.print_exc()
+                ok = False
+            if not ok:
+                engine_failed += 1
+                print(f"{name}: flow {i} not fully positioned")
+        print(f"{name:>16}: {len(flows) - engine_failed} of {len(flows)} flows fully positioned")
+        failed += engine_failed
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
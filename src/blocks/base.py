@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import Dict, Any, TYPE_CHECKING
+from typing import Dict, Any, ClassVar, Tuple, TYPE_CHECKING
 import uuid
 
 if TYPE_CHECKING:
@@ -8,7 +8,17 @@ else:
     Self = object
 
 
-@dataclass
+def copy_json(value: Any) -> Any:
+    """Copy the dicts and lists of a JSON-like value; strings and numbers are shared."""
+    if isinstance(value, dict):
+        return {key: copy_json(item) if isinstance(item, (dict, list)) else item
+                for key, item in value.items()}
+    if isinstance(value, list):
+        return [copy_json(item) if isinstance(item, (dict, list)) else item for item in value]
+    return value
+
+
+@dataclass(slots=True)
 class FlowBlock:
     """
     Base class for all Amazon Connect contact flow blocks.
@@ -16,12 +26,70 @@ class FlowBlock:
     """
     identifier: str = field(default_factory=lambda: str(uuid.uuid4()))
     type: str = "BaseBlock"
+    # Blocks described entirely by typed fields (those defining
+    # _build_parameters) build this from them when it is first read after
+    # an edit, rather than holding a second copy from construction on.
+    # Blocks that also pass untyped parameters through (e.g.
+    # InvokeLambdaFunction, Wait) mirror their typed fields in here
     parameters: Dict[str, Any] = field(default_factory=dict)
     transitions: Dict[str, Any] = field(default_factory=dict)
+    # Bumped by the wiring methods and field assignments so builders can
+    # detect edited blocks
+    _revision: int = field(default=0, init=False, repr=False, compare=False)
+    # ((nested object, version) pairs parameters were last built from,
+    # parameter names holding dicts or lists); None when a field has been
+    # assigned since
+    _parameters_key: Any = field(default=None, init=False, repr=False, compare=False)
+
+    # Typed fields holding nested ParameterType objects
+    _NESTED_FIELDS: ClassVar[Tuple[str, ...]] = ()
+
+    def __init_subclass__(cls):
+        # Also runs for the class dataclass(slots=True) recreates, which
+        # drops inherited field names from the class dict
+        if hasattr(cls, "_build_parameters"):
+            cls.parameters = _typed_parameters
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name[0] != "_":
+            object.__setattr__(self, "_parameters_key", None)
+            # Blocks with typed fields rebuild parameters from them on
+            # serialization, so for those replacing parameters is not an edit
+            if not (name == "parameters" and hasattr(self, "_build_parameters")):
+                object.__setattr__(self, "_revision", getattr(self, "_revision", 0) + 1)
+        object.__setattr__(self, name, value)
+
+    def cache_version(self) -> Any:
+        """Changes whenever the block or one of its nested typed fields is edited."""
+        if not self._NESTED_FIELDS:
+            return self._revision
+        return (self._revision,) + tuple(
+            nested.cache_version() if nested is not None else None
+            for nested in (getattr(self, name) for name in self._NESTED_FIELDS)
+        )
+
+    def _materialize_parameters(self) -> None:
+        """Rebuild parameters from typed fields, unless nothing changed since the last build."""
+        key = self._parameters_key
+        if key is not None:
+            for nested, version in key[0]:
+                if nested.cache_version() != version:
+                    break
+            else:
+                return
+        self._build_parameters()
+        self._parameters_key = (
+            tuple((nested, nested.cache_version())
+                  for nested in (getattr(self, name) for name in self._NESTED_FIELDS)
+                  if nested is not None),
+            tuple(name for name, value in _parameters_slot.__get__(self).items()
+                  if isinstance(value, (dict, list))),
+        )
 
     def then(self, next_block: 'FlowBlock') -> 'Self':
         """Set the next action for this block."""
         self.transitions["NextAction"] = next_block.identifier
+        self._revision += 1
         return self
 
     def on_error(self, error_type: str, next_block: 'FlowBlock') -> 'Self':
@@ -32,14 +100,22 @@ class FlowBlock:
             "NextAction": next_block.identifier,
             "ErrorType": error_type
         })
+        self._revision += 1
         return self
 
     def to_dict(self) -> dict:
         """Serialize block to AWS Connect JSON format."""
+        parameters = self.parameters
+        if hasattr(self, "_build_parameters"):
+            # Kept between serializations, so callers get their own copy
+            built = parameters
+            parameters = built.copy()
+            for name in self._parameters_key[1]:
+                parameters[name] = copy_json(built[name])
         return {
             "Identifier": self.identifier,
             "Type": self.type,
-            "Parameters": self.parameters,
+            "Parameters": parameters,
             "Transitions": self.transitions
         }
 
@@ -47,8 +123,22 @@ class FlowBlock:
     def from_dict(cls, data: dict) -> 'FlowBlock':
         """Deserialize from AWS Connect JSON format."""
         return cls(
-            identifier=data.get("Identifier", str(uuid.uuid4())),
+            identifier=data.get("Identifier") or str(uuid.uuid4()),
             type=data.get("Type", "BaseBlock"),
             parameters=data.get("Parameters", {}),
             transitions=data.get("Transitions", {})
         )
+
+
+# Storage of FlowBlock.parameters; typed blocks read it through
+# _typed_parameters, which rebuilds it from their fields first
+_parameters_slot = FlowBlock.parameters
+
+
+def _get_typed_parameters(block: FlowBlock) -> Dict[str, Any]:
+    block._materialize_parameters()
+    return _parameters_slot.__get__(block)
+
+
+_typed_parameters = property(_get_typed_parameters, _parameters_slot.__set__,
+                             doc="Parameters as serialized, built from the typed fields")
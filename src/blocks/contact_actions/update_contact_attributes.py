@@ -8,7 +8,7 @@ import uuid
 from ..base import FlowBlock
 
 
-@dataclass
+@dataclass(slots=True)
 class UpdateContactAttributes(FlowBlock):
     """Set or update contact attributes."""
     attributes: Optional[Dict[str, Any]] = None
@@ -19,7 +19,7 @@ class UpdateContactAttributes(FlowBlock):
             self.parameters["Attributes"] = self.attributes
 
     def to_dict(self) -> dict:
-        data = super().to_dict()
+        data = FlowBlock.to_dict(self)
         if self.attributes:
             data["Parameters"]["Attributes"] = self.attributes
         return data
@@ -28,7 +28,7 @@ class UpdateContactAttributes(FlowBlock):
     def from_dict(cls, data: dict) -> 'UpdateContactAttributes':
         params = data.get("Parameters", {})
         return cls(
-            identifier=data.get("Identifier", str(uuid.uuid4())),
+            identifier=data.get("Identifier") or str(uuid.uuid4()),
             attributes=params.get("Attributes"),
             parameters=params,
             transitions=data.get("Transitions", {})
@@ -7,7 +7,7 @@ import uuid
 from ..base import FlowBlock
 
 
-@dataclass
+@dataclass(slots=True)
 class UpdateContactEventHooks(FlowBlock):
     """Update contact event hooks."""
 
@@ -18,7 +18,7 @@ class UpdateContactEventHooks(FlowBlock):
     def from_dict(cls, data: dict) -> 'UpdateContactEventHooks':
         params = data.get("Parameters", {})
         return cls(
-            identifier=data.get("Identifier", str(uuid.uuid4())),
+            identifier=data.get("Identifier") or str(uuid.uuid4()),
             parameters=params,
             transitions=data.get("Transitions", {})
         )
@@ -8,7 +8,7 @@ import uuid
 from ..base import FlowBlock
 
 
-@dataclass
+@dataclass(slots=True)
 class UpdateContactRecordingBehavior(FlowBlock):
     """Update contact recording behavior."""
     recording_behavior: Optional[Dict[str, Any]] = None
@@ -19,7 +19,7 @@ class UpdateContactRecordingBehavior(FlowBlock):
             self.parameters["RecordingBehavior"] = self.recording_behavior
 
     def to_dict(self) -> dict:
-        data = super().to_dict()
+        data = FlowBlock.to_dict(self)
         if self.recording_behavior:
             data["Parameters"]["RecordingBehavior"] = self.recording_behavior
         return data
@@ -28,7 +28,7 @@ class UpdateContactRecordingBehavior(FlowBlock):
     def from_dict(cls, data: dict) -> 'UpdateContactRecordingBehavior':
         params = data.get("Parameters", {})
         return cls(
-            identifier=data.get("Identifier", str(uuid.uuid4())),
+            identifier=data.get("Identifier") or str(uuid.uuid4()),
             recording_behavior=params.get("RecordingBehavior"),
             parameters=params,
             transitions=data.get("Transitions", {})
@@ -7,7 +7,7 @@ import uuid
 from ..base import FlowBlock
 
 
-@dataclass
+@dataclass(slots=True)
 class CheckMetricData(FlowBlock):
     """Check queue metrics data."""
 
@@ -18,7 +18,7 @@ class CheckMetricData(FlowBlock):
     def from_dict(cls, data: dict) -> 'CheckMetricData':
         params = data.get("Parameters", {})
         return cls(
-            identifier=data.get("Identifier", str(uuid.uuid4())),
+            identifier=data.get("Identifier") or str(uuid.uuid4()),
             parameters=params,
             transitions=data.get("Transitions", {})
         )
@@ -7,7 +7,7 @@ import uuid
 from ..base import FlowBlock
 
 
-@dataclass
+@dataclass(slots=True)
 class Compare(FlowBlock):
     """Compare/branch block for conditional logic."""
     comparison_value: str = ""
@@ -18,7 +18,7 @@ class Compare(FlowBlock):
             self.parameters["ComparisonValue"] = self.comparison_value
 
     def to_dict(self) -> dict:
-        data = super().to_dict()
+        data = FlowBlock.to_dict(self)
         if self.comparison_value:
             data["Parameters"]["ComparisonValue"] = self.comparison_value
         return data
@@ -27,7 +27,7 @@ class Compare(FlowBlock):
     def from_dict(cls, data: dict) -> 'Compare':
         params = data.get("Parameters", {})
         return cls(
-            identifier=data.get("Identifier", str(uuid.uuid4())),
+            identifier=data.get("Identifier") or str(uuid.uuid4()),
             comparison_value=params.get("ComparisonValue", ""),
             parameters=params,
             transitions=data.get("Transitions", {})
@@ -7,7 +7,7 @@ import uuid
 from ..base import FlowBlock
 
 
-@dataclass
+@dataclass(slots=True)
 class EndFlowExecution(FlowBlock):
     """End flow execution block."""
 
@@ -17,7 +17,7 @@ class EndFlowExecution(FlowBlock):
     @classmethod
     def from_dict(cls, data: dict) -> 'EndFlowExecution':
         return cls(
-            identifier=data.get("Identifier", str(uuid.uuid4())),
+            identifier=data.get("Identifier") or str(uuid.uuid4()),
             parameters=data.get("Parameters", {}),
             transitions=data.get("Transitions", {})
         )
@@ -7,7 +7,7 @@ import uuid
 from ..base import FlowBlock
 
 
-@dataclass
+@dataclass(slots=True)
 class TransferToFlow(FlowBlock):
     """Transfer to another contact flow."""
     contact_flow_id: str = ""
@@ -18,7 +18,7 @@ class TransferToFlow(FlowBlock):
             self.parameters["ContactFlowId"] = self.contact_flow_id
 
     def to_dict(self) -> dict:
-        data = super().to_dict()
+        data = FlowBlock.to_dict(self)
         if self.contact_flow_id:
             data["Parameters"]["ContactFlowId"] = self.contact_flow_id
         return data
@@ -27,7 +27,7 @@ class TransferToFlow(FlowBlock):
     def from_dict(cls, data: dict) -> 'TransferToFlow':
         params = data.get("Parameters", {})
         return cls(
-            identifier=data.get("Identifier", str(uuid.uuid4())),
+            identifier=data.get("Identifier") or str(uuid.uuid4()),
             contact_flow_id=params.get("ContactFlowId", ""),
             parameters=params,
             transitions=data.get("Transitions", {})
@@ -8,7 +8,7 @@ import uuid
 from ..base import FlowBlock
 
 
-@dataclass
+@dataclass(slots=True)
 class Wait(FlowBlock):
     """Wait block for pausing flow execution."""
     time_limit_seconds: str = "60"
@@ -24,14 +24,14 @@ class Wait(FlowBlock):
             self.parameters["Events"] = self.events
 
     def to_dict(self) -> dict:
-        data = super().to_dict()
+        data = FlowBlock.to_dict(self)
         return data
 
     @classmethod
     def from_dict(cls, data: dict) -> 'Wait':
         params = data.get("Parameters", {})
         return cls(
-            identifier=data.get("Identifier", str(uuid.uuid4())),
+            identifier=data.get("Identifier") or str(uuid.uuid4()),
             time_limit_seconds=params.get("TimeLimitSeconds", "60"),
             events=params.get("Events", []),
             parameters=params,
@@ -7,7 +7,7 @@ import uuid
 from ..base import FlowBlock
 
 
-@dataclass
+@dataclass(slots=True)
 class CreateCallbackContact(FlowBlock):
     """Create a callback contact."""
 
@@ -18,7 +18,7 @@ class CreateCallbackContact(FlowBlock):
     def from_dict(cls, data: dict) -> 'CreateCallbackContact':
         params = data.get("Parameters", {})
         return cls(
-            identifier=data.get("Identifier", str(uuid.uuid4())),
+            identifier=data.get("Identifier") or str(uuid.uuid4()),
             parameters=params,
             transitions=data.get("Transitions", {})
         )
@@ -8,7 +8,7 @@ import uuid
 from ..base import FlowBlock
 
 
-@dataclass
+@dataclass(slots=True)
 class InvokeLambdaFunction(FlowBlock):
     """Invoke AWS Lambda function."""
     lambda_function_arn: str = ""
@@ -24,14 +24,14 @@ class InvokeLambdaFunction(FlowBlock):
             self.parameters["InvocationTimeLimitSeconds"] = self.invocation_time_limit_seconds
 
     def to_dict(self) -> dict:
-        data = super().to_dict()
+        data = FlowBlock.to_dict(self)
         return data
 
     @classmethod
     def from_dict(cls, data: dict) -> 'InvokeLambdaFunction':
         params = data.get("Parameters", {})
         return cls(
-            identifier=data.get("Identifier", str(uuid.uuid4())),
+            identifier=data.get("Identifier") or str(uuid.uuid4()),
             lambda_function_arn=params.get("LambdaFunctionARN", ""),
             invocation_time_limit_seconds=params.get("InvocationTimeLimitSeconds", "8"),
             parameters=params,
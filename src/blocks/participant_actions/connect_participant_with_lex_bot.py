@@ -3,7 +3,7 @@ ConnectParticipantWithLexBot - Connect participant to a Lex bot.
 https://docs.aws.amazon.com/connect/latest/APIReference/participant-actions-connectparticipantwithlexbot.html
 """
 from dataclasses import dataclass
-from typing import Optional, Dict, Any, TYPE_CHECKING
+from typing import Optional, Dict, Any, ClassVar, Tuple, TYPE_CHECKING
 import uuid
 from ..base import FlowBlock
 from ..types import Media, LexV2Bot, LexBot
@@ -14,7 +14,7 @@ else:
     Self = object
 
 
-@dataclass
+@dataclass(slots=True)
 class ConnectParticipantWithLexBot(FlowBlock):
     """
     Connect the participant to an Amazon Lex bot for conversational AI.
@@ -51,9 +51,10 @@ class ConnectParticipantWithLexBot(FlowBlock):
     lex_initialization_data: Optional[Dict[str, str]] = None  # {"InitialMessage": "..."}
     lex_timeout_seconds: Optional[Dict[str, str]] = None  # {"Text": "..."}
 
+    _NESTED_FIELDS: ClassVar[Tuple[str, ...]] = ("media", "lex_v2_bot", "lex_bot")
+
     def __post_init__(self):
         self.type = "ConnectParticipantWithLexBot"
-        self._build_parameters()
 
     def _build_parameters(self):
         """Build parameters dict from typed attributes."""
@@ -97,12 +98,9 @@ class ConnectParticipantWithLexBot(FlowBlock):
                 "Operands": [intent_name]
             }
         })
+        self._revision += 1
         return self
 
-    def to_dict(self) -> dict:
-        self._build_parameters()
-        return super().to_dict()
-
     @classmethod
     def from_dict(cls, data: dict) -> 'ConnectParticipantWithLexBot':
         params = data.get("Parameters", {})
@@ -113,7 +111,7 @@ class ConnectParticipantWithLexBot(FlowBlock):
         lex_bot_data = params.get("LexBot")
 
         return cls(
-            identifier=data.get("Identifier", str(uuid.uuid4())),
+            identifier=data.get("Identifier") or str(uuid.uuid4()),
             text=params.get("Text"),
             prompt_id=params.get("PromptId"),
             ssml=params.get("SSML"),
@@ -123,6 +121,5 @@ class ConnectParticipantWithLexBot(FlowBlock):
             lex_session_attributes=params.get("LexSessionAttributes"),
             lex_initialization_data=params.get("LexInitializationData"),
             lex_timeout_seconds=params.get("LexTimeoutSeconds"),
-            parameters=params,
             transitions=data.get("Transitions", {})
         )
@@ -7,7 +7,7 @@ import uuid
 from ..base import FlowBlock
 
 
-@dataclass
+@dataclass(slots=True)
 class DisconnectParticipant(FlowBlock):
     """
     Disconnect the participant from the contact and stop the flow.
@@ -32,7 +32,7 @@ class DisconnectParticipant(FlowBlock):
     @classmethod
     def from_dict(cls, data: dict) -> 'DisconnectParticipant':
         return cls(
-            identifier=data.get("Identifier", str(uuid.uuid4())),
+            identifier=data.get("Identifier") or str(uuid.uuid4()),
             parameters=data.get("Parameters", {}),
             transitions=data.get("Transitions", {})
         )
@@ -3,7 +3,7 @@ GetParticipantInput - Gather customer input (DTMF or text).
 https://docs.aws.amazon.com/connect/latest/APIReference/participant-actions-getparticipantinput.html
 """
 from dataclasses import dataclass
-from typing import Optional, Dict, Any, TYPE_CHECKING
+from typing import Optional, Dict, Any, ClassVar, Tuple, TYPE_CHECKING
 import uuid
 from ..base import FlowBlock
 from ..types import Media, InputValidation, InputEncryption, DTMFConfiguration
@@ -14,7 +14,7 @@ else:
     Self = object
 
 
-@dataclass
+@dataclass(slots=True)
 class GetParticipantInput(FlowBlock):
     """
     Gather customer input with optional validation, encryption, and storage.
@@ -55,9 +55,10 @@ class GetParticipantInput(FlowBlock):
     input_encryption: Optional[InputEncryption] = None
     dtmf_configuration: Optional[DTMFConfiguration] = None
 
+    _NESTED_FIELDS: ClassVar[Tuple[str, ...]] = ("media", "input_validation", "input_encryption", "dtmf_configuration")
+
     def __post_init__(self):
         self.type = "GetParticipantInput"
-        self._build_parameters()
 
     def _build_parameters(self):
         """Build parameters dict from typed attributes."""
@@ -99,17 +100,15 @@ class GetParticipantInput(FlowBlock):
                 "Operands": [value]
             }
         })
+        self._revision += 1
         return self
 
     def otherwise(self, next_block: FlowBlock) -> 'Self':
         """Set the default action when no conditions match."""
         self.transitions["NextAction"] = next_block.identifier
+        self._revision += 1
         return self
 
-    def to_dict(self) -> dict:
-        self._build_parameters()
-        return super().to_dict()
-
     @classmethod
     def from_dict(cls, data: dict) -> 'GetParticipantInput':
         params = data.get("Parameters", {})
@@ -121,7 +120,7 @@ class GetParticipantInput(FlowBlock):
         dtmf_config_data = params.get("DTMFConfiguration")
 
         return cls(
-            identifier=data.get("Identifier", str(uuid.uuid4())),
+            identifier=data.get("Identifier") or str(uuid.uuid4()),
             text=params.get("Text"),
             prompt_id=params.get("PromptId"),
             ssml=params.get("SSML"),
@@ -131,6 +130,5 @@ class GetParticipantInput(FlowBlock):
             input_validation=InputValidation.from_dict(input_validation_data) if input_validation_data else None,
             input_encryption=InputEncryption.from_dict(input_encryption_data) if input_encryption_data else None,
             dtmf_configuration=DTMFConfiguration.from_dict(dtmf_config_data) if dtmf_config_data else None,
-            parameters=params,
             transitions=data.get("Transitions", {})
         )
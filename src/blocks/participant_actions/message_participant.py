@@ -3,13 +3,13 @@ MessageParticipant - Play prompt / send message to participant.
 https://docs.aws.amazon.com/connect/latest/APIReference/participant-actions-messageparticipant.html
 """
 from dataclasses import dataclass
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, ClassVar, Tuple
 import uuid
 from ..base import FlowBlock
 from ..types import Media
 
 
-@dataclass
+@dataclass(slots=True)
 class MessageParticipant(FlowBlock):
     """
     Send a message to the participant.
@@ -32,9 +32,10 @@ class MessageParticipant(FlowBlock):
     ssml: Optional[str] = None
     media: Optional[Media] = None
 
+    _NESTED_FIELDS: ClassVar[Tuple[str, ...]] = ("media",)
+
     def __post_init__(self):
         self.type = "MessageParticipant"
-        self._build_parameters()
 
     def _build_parameters(self):
         """Build parameters dict from typed attributes."""
@@ -50,20 +51,15 @@ class MessageParticipant(FlowBlock):
             params["Media"] = self.media.to_dict()
         self.parameters = params
 
-    def to_dict(self) -> dict:
-        self._build_parameters()
-        return super().to_dict()
-
     @classmethod
     def from_dict(cls, data: dict) -> 'MessageParticipant':
         params = data.get("Parameters", {})
         media_data = params.get("Media")
         return cls(
-            identifier=data.get("Identifier", str(uuid.uuid4())),
+            identifier=data.get("Identifier") or str(uuid.uuid4()),
             text=params.get("Text"),
             prompt_id=params.get("PromptId"),
             ssml=params.get("SSML"),
             media=Media.from_dict(media_data) if media_data else None,
-            parameters=params,
             transitions=data.get("Transitions", {})
         )
@@ -8,7 +8,7 @@ import uuid
 from ..base import FlowBlock
 
 
-@dataclass
+@dataclass(slots=True)
 class MessageParticipantIteratively(FlowBlock):
     """
     Play multiple messages in sequence.
@@ -33,7 +33,6 @@ class MessageParticipantIteratively(FlowBlock):
 
     def __post_init__(self):
         self.type = "MessageParticipantIteratively"
-        self._build_parameters()
 
     def _build_parameters(self):
         """Build parameters dict from typed attributes."""
@@ -44,17 +43,12 @@ class MessageParticipantIteratively(FlowBlock):
             params["InterruptFrequencySeconds"] = self.interrupt_frequency_seconds
         self.parameters = params
 
-    def to_dict(self) -> dict:
-        self._build_parameters()
-        return super().to_dict()
-
     @classmethod
     def from_dict(cls, data: dict) -> 'MessageParticipantIteratively':
         params = data.get("Parameters", {})
         return cls(
-            identifier=data.get("Identifier", str(uuid.uuid4())),
+            identifier=data.get("Identifier") or str(uuid.uuid4()),
             messages=params.get("Messages"),
             interrupt_frequency_seconds=params.get("InterruptFrequencySeconds"),
-            parameters=params,
             transitions=data.get("Transitions", {})
         )
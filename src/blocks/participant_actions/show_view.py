@@ -3,7 +3,7 @@ ShowView - Display a view in the agent workspace.
 https://docs.aws.amazon.com/connect/latest/APIReference/participant-actions-showview.html
 """
 from dataclasses import dataclass
-from typing import Optional, Dict, Any, List, TYPE_CHECKING
+from typing import Optional, Dict, Any, List, ClassVar, Tuple, TYPE_CHECKING
 import uuid
 from ..base import FlowBlock
 from ..types import ViewResource
@@ -14,7 +14,7 @@ else:
     Self = object
 
 
-@dataclass
+@dataclass(slots=True)
 class ShowView(FlowBlock):
     """
     Show a view resource in the agent workspace UI.
@@ -38,9 +38,10 @@ class ShowView(FlowBlock):
     view_data: Optional[Dict[str, Any]] = None
     sensitive_data_configuration: Optional[Dict[str, List[str]]] = None  # {"HideResponseOn": ["TRANSCRIPT"]}
 
+    _NESTED_FIELDS: ClassVar[Tuple[str, ...]] = ("view_resource",)
+
     def __post_init__(self):
         self.type = "ShowView"
-        self._build_parameters()
 
     def _build_parameters(self):
         """Build parameters dict from typed attributes."""
@@ -69,12 +70,9 @@ class ShowView(FlowBlock):
                 "Operands": [action_name]
             }
         })
+        self._revision += 1
         return self
 
-    def to_dict(self) -> dict:
-        self._build_parameters()
-        return super().to_dict()
-
     @classmethod
     def from_dict(cls, data: dict) -> 'ShowView':
         params = data.get("Parameters", {})
@@ -83,11 +81,10 @@ class ShowView(FlowBlock):
         view_resource_data = params.get("ViewResource")
 
         return cls(
-            identifier=data.get("Identifier", str(uuid.uuid4())),
+            identifier=data.get("Identifier") or str(uuid.uuid4()),
             view_resource=ViewResource.from_dict(view_resource_data) if view_resource_data else None,
             invocation_time_limit_seconds=params.get("InvocationTimeLimitSeconds"),
             view_data=params.get("ViewData"),
             sensitive_data_configuration=params.get("SensitiveDataConfiguration"),
-            parameters=params,
             transitions=data.get("Transitions", {})
         )
@@ -3,11 +3,51 @@ Shared types for Amazon Connect flow blocks.
 https://docs.aws.amazon.com/connect/latest/APIReference/contact-actions.html
 """
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, ClassVar, Optional, Tuple
+from .base import copy_json
 
 
-@dataclass
-class Media:
+class ParameterType:
+    """
+    Base for the nested parameter types below.
+
+    to_dict() is cached until a field is assigned and returns a copy of the
+    cached dict. cache_version() changes whenever this object or a nested
+    ParameterType field changes, so a block can tell whether parameters
+    built from it are still current.
+    """
+    __slots__ = ("_revision", "_cached")
+
+    # Fields holding nested ParameterType objects
+    _NESTED_FIELDS: ClassVar[Tuple[str, ...]] = ()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        object.__setattr__(self, "_revision", getattr(self, "_revision", 0) + 1)
+
+    def cache_version(self) -> Any:
+        revision = getattr(self, "_revision", 0)
+        if not self._NESTED_FIELDS:
+            return revision
+        return (revision,) + tuple(
+            nested.cache_version() if nested is not None else None
+            for nested in (getattr(self, name) for name in self._NESTED_FIELDS)
+        )
+
+    def to_dict(self) -> dict:
+        version = self.cache_version()
+        cached = getattr(self, "_cached", None)
+        if cached is None or cached[0] != version:
+            cached = (version, self._build_dict())
+            object.__setattr__(self, "_cached", cached)
+        return copy_json(cached[1])
+
+    def _build_dict(self) -> dict:
+        raise NotImplementedError
+
+
+@dataclass(slots=True)
+class Media(ParameterType):
     """
     External media source configuration.
     Used by MessageParticipant, GetParticipantInput, etc.
@@ -18,7 +58,7 @@ class Media:
     source_type: str = "S3"      # Only S3 is supported
     media_type: str = "Audio"    # Only Audio is supported
 
-    def to_dict(self) -> dict:
+    def _build_dict(self) -> dict:
         return {
             "Uri": self.uri,
             "SourceType": self.source_type,
@@ -34,15 +74,15 @@ class Media:
         )
 
 
-@dataclass
-class LexV2Bot:
+@dataclass(slots=True)
+class LexV2Bot(ParameterType):
     """
     LexV2 bot configuration.
     Used by ConnectParticipantWithLexBot.
     """
     alias_arn: str
 
-    def to_dict(self) -> dict:
+    def _build_dict(self) -> dict:
         return {"AliasArn": self.alias_arn}
 
     @classmethod
@@ -50,8 +90,8 @@ class LexV2Bot:
         return cls(alias_arn=data["AliasArn"])
 
 
-@dataclass
-class LexBot:
+@dataclass(slots=True)
+class LexBot(ParameterType):
     """
     Legacy Lex bot configuration.
     Used by ConnectParticipantWithLexBot.
@@ -60,7 +100,7 @@ class LexBot:
     region: str
     alias: str
 
-    def to_dict(self) -> dict:
+    def _build_dict(self) -> dict:
         return {
             "Name": self.name,
             "Region": self.region,
@@ -76,15 +116,15 @@ class LexBot:
         )
 
 
-@dataclass
-class ViewResource:
+@dataclass(slots=True)
+class ViewResource(ParameterType):
     """
     View resource configuration for ShowView block.
     """
     id: str
     version: str
 
-    def to_dict(self) -> dict:
+    def _build_dict(self) -> dict:
         return {
             "Id": self.id,
             "Version": self.version
@@ -98,13 +138,13 @@ class ViewResource:
         )
 
 
-@dataclass
-class PhoneNumberValidation:
+@dataclass(slots=True)
+class PhoneNumberValidation(ParameterType):
     """Phone number validation for GetParticipantInput."""
     number_format: str  # "Local" or "E164"
     country_code: Optional[str] = None  # Required if format is "Local"
 
-    def to_dict(self) -> dict:
+    def _build_dict(self) -> dict:
         result = {"NumberFormat": self.number_format}
         if self.country_code:
             result["CountryCode"] = self.country_code
@@ -118,12 +158,12 @@ class PhoneNumberValidation:
         )
 
 
-@dataclass
-class CustomValidation:
+@dataclass(slots=True)
+class CustomValidation(ParameterType):
     """Custom validation for GetParticipantInput."""
     maximum_length: str
 
-    def to_dict(self) -> dict:
+    def _build_dict(self) -> dict:
         return {"MaximumLength": self.maximum_length}
 
     @classmethod
@@ -131,13 +171,15 @@ class CustomValidation:
         return cls(maximum_length=data["MaximumLength"])
 
 
-@dataclass
-class InputValidation:
+@dataclass(slots=True)
+class InputValidation(ParameterType):
     """Input validation configuration for GetParticipantInput."""
+    _NESTED_FIELDS: ClassVar[Tuple[str, ...]] = ("phone_number_validation", "custom_validation")
+
     phone_number_validation: Optional[PhoneNumberValidation] = None
     custom_validation: Optional[CustomValidation] = None
 
-    def to_dict(self) -> dict:
+    def _build_dict(self) -> dict:
         result = {}
         if self.phone_number_validation:
             result["PhoneNumberValidation"] = self.phone_number_validation.to_dict()
@@ -153,13 +195,13 @@ class InputValidation:
         )
 
 
-@dataclass
-class InputEncryption:
+@dataclass(slots=True)
+class InputEncryption(ParameterType):
     """Input encryption configuration for GetParticipantInput."""
     encryption_key_id: Optional[str] = None
     key: Optional[str] = None  # PEM public key
 
-    def to_dict(self) -> dict:
+    def _build_dict(self) -> dict:
         result = {}
         if self.encryption_key_id:
             result["EncryptionKeyId"] = self.encryption_key_id
@@ -175,14 +217,14 @@ class InputEncryption:
         )
 
 
-@dataclass
-class DTMFConfiguration:
+@dataclass(slots=True)
+class DTMFConfiguration(ParameterType):
     """DTMF configuration for GetParticipantInput."""
     input_termination_sequence: Optional[str] = None  # Up to 5 digits
     disable_cancel_key: Optional[str] = None  # "True" or "False"
     interdigit_time_limit_seconds: Optional[str] = None  # 1-20 seconds
 
-    def to_dict(self) -> dict:
+    def _build_dict(self) -> dict:
         result = {}
         if self.input_termination_sequence:
             result["InputTerminationSequence"] = self.input_termination_sequence
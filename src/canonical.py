@@ -0,0 +1,49 @@
+"""
+Canonical Flow Form - Formatting- and order-independent hashes of flow JSON.
+
+The content hash covers Version, StartAction and the set of actions, so it
+does not change when actions are reordered or the JSON is re-indented.
+Layout (Metadata) is hashed separately, so a block that merely moved can be
+told apart from a semantic change.
+
+Example:
+    content, layout = flow_hashes(flow.compile())
+"""
+import hashlib
+from typing import Any, Iterable, Tuple
+from json_backend import canonical_dumps
+
+
+def canonical_json(value: Any) -> str:
+    """Compact JSON with sorted keys; equal values give equal strings."""
+    return canonical_dumps(value)
+
+
+def action_digest(action: dict) -> bytes:
+    """SHA-256 of one action's canonical JSON."""
+    return hashlib.sha256(canonical_json(action).encode()).digest()
+
+
+def content_hash(version: str, start_action: str, actions: Iterable[dict]) -> str:
+    """Hash of a flow's semantics, independent of action order.
+
+    actions is consumed once, so it can be a generator over blocks.
+    """
+    digest = hashlib.sha256(canonical_json([version, start_action]).encode())
+    for action in sorted(action_digest(action) for action in actions):
+        digest.update(action)
+    return digest.hexdigest()
+
+
+def layout_hash(metadata: dict) -> str:
+    """Hash of a flow's layout-only Metadata (positions, canvas settings)."""
+    return hashlib.sha256(canonical_json(metadata).encode()).hexdigest()
+
+
+def flow_hashes(flow_json: dict) -> Tuple[str, str]:
+    """(content hash, layout hash) of a compiled or loaded flow."""
+    return (
+        content_hash(flow_json.get("Version", ""), flow_json.get("StartAction", ""),
+                     flow_json.get("Actions", [])),
+        layout_hash(flow_json.get("Metadata", {})),
+    )
@@ -1,6 +1,6 @@
 from dataclasses import dataclass, field
 from typing import Dict, List, Any
-import json
+import json_backend
 from blocks.base import FlowBlock
 
 
@@ -23,4 +23,4 @@ class ContactFlow:
 
     def to_json(self, indent: int = 2) -> str:
         """Convert flow to JSON string."""
-        return json.dumps(self.to_dict(), indent=indent)
+        return json_backend.dumps(self.to_dict(), indent=indent)
@@ -1,5 +1,7 @@
 import json
-from typing import Dict, Type
+import json_backend
+from dataclasses import dataclass, field
+from typing import Dict, List, Type, ClassVar
 from blocks import (
     FlowBlock,
     # Participant Actions
@@ -31,6 +33,108 @@ from blocks import (
 from contact_flow import ContactFlow
 
 
+class LazyBlock:
+    """An action kept as its raw JSON dict until a typed attribute is used.
+
+    identifier, type, parameters, transitions and to_dict() are read from
+    the dict. Any other attribute (typed fields such as text or media,
+    wiring methods) or any assignment builds the typed block with
+    from_dict, and everything is delegated to it from then on. Until then,
+    to_dict() returns the action's Parameters and Transitions as given.
+    Reading never writes into the action dict: an action without
+    Parameters or Transitions is built when that attribute is read.
+    """
+
+    __slots__ = ("_data", "_block_class", "_block")
+
+    def __init__(self, data: dict, block_class: Type[FlowBlock]):
+        object.__setattr__(self, "_data", data)
+        object.__setattr__(self, "_block_class", block_class)
+        object.__setattr__(self, "_block", None)
+        if not data.get("Identifier"):
+            self.materialize()  # from_dict assigns a fresh identifier
+
+    def materialize(self) -> FlowBlock:
+        """The typed block, built on first use."""
+        if self._block is None:
+            object.__setattr__(self, "_block", self._block_class.from_dict(self._data))
+        return self._block
+
+    @property
+    def materialized(self) -> bool:
+        return self._block is not None
+
+    @property
+    def identifier(self) -> str:
+        return self._block.identifier if self._block is not None else self._data["Identifier"]
+
+    @property
+    def type(self) -> str:
+        return self._block.type if self._block is not None else self._data.get("Type", "BaseBlock")
+
+    @property
+    def parameters(self) -> dict:
+        if self._block is None and "Parameters" in self._data:
+            return self._data["Parameters"]
+        return self.materialize().parameters
+
+    @property
+    def transitions(self) -> dict:
+        if self._block is None and "Transitions" in self._data:
+            return self._data["Transitions"]
+        return self.materialize().transitions
+
+    def to_dict(self) -> dict:
+        if self._block is not None:
+            return self._block.to_dict()
+        data = self._data
+        return {
+            "Identifier": data["Identifier"],
+            "Type": data.get("Type", "BaseBlock"),
+            "Parameters": data.get("Parameters", {}),
+            "Transitions": data.get("Transitions", {})
+        }
+
+    def __getattr__(self, name: str):
+        return getattr(self.materialize(), name)
+
+    def __setattr__(self, name: str, value) -> None:
+        setattr(self.materialize(), name, value)
+
+    def __repr__(self) -> str:
+        state = "" if self._block is None else ", materialized"
+        return f"LazyBlock({self.type}, {self.identifier}{state})"
+
+
+@dataclass
+class DecompileDiagnostics:
+    """Findings collected while decompiling a flow."""
+    MAX_SAMPLES: ClassVar[int] = 3  # Sample identifiers kept per unknown type
+
+    action_count: int = 0
+    unknown_type_counts: Dict[str, int] = field(default_factory=dict)
+    unknown_samples: Dict[str, List[str]] = field(default_factory=dict)
+
+    @property
+    def has_unknown_blocks(self) -> bool:
+        return bool(self.unknown_type_counts)
+
+    def record_unknown(self, block_type: str, identifier: str):
+        """Count an action of an unknown type, keeping a few sample IDs."""
+        self.unknown_type_counts[block_type] = self.unknown_type_counts.get(block_type, 0) + 1
+        samples = self.unknown_samples.setdefault(block_type, [])
+        if len(samples) < self.MAX_SAMPLES:
+            samples.append(identifier)
+
+    def summary(self) -> str:
+        """One-line description of the unknown block types found."""
+        if not self.has_unknown_blocks:
+            return f"{self.action_count} actions, no unknown block types"
+        counts = sorted(self.unknown_type_counts.items(), key=lambda item: str(item[0]))
+        types = ", ".join(f"{block_type} x{count}" for block_type, count in counts)
+        return f"{self.action_count} actions, {len(self.unknown_type_counts)} unknown block type(s): {types}"
+
+
 class FlowDecompiler:
     """Decompile AWS Connect JSON into FlowBlock objects."""
     
@@ -64,28 +168,37 @@ class FlowDecompiler:
     }
 
     @classmethod
-    def decompile(cls, flow_json: dict) -> tuple[ContactFlow, bool]:
+    def decompile_with_diagnostics(cls, flow_json: dict, verbose: bool = False,
+                                   lazy: bool = False) -> tuple[ContactFlow, DecompileDiagnostics]:
         """
         Parse AWS Connect JSON into a ContactFlow object.
-        Returns tuple of (ContactFlow, has_unknown_blocks)
+        Returns tuple of (ContactFlow, DecompileDiagnostics).
+        With verbose, unknown blocks are also printed as they are found.
+        With lazy, actions are LazyBlock proxies over the JSON dicts, typed
+        only when a typed attribute is used.
         """
         actions = []
-        unknown_types = set()
+        diagnostics = DecompileDiagnostics()
         
         for action_data in flow_json.get("Actions", []):
             block_type = action_data.get("Type")
             
             if block_type not in cls.BLOCK_TYPE_MAP:
-                unknown_types.add(block_type)
-                print(f"[WARNING] Unknown block type: {block_type}")
-                print(f"   Block data: {json.dumps(action_data, indent=2)}\n")
+                diagnostics.record_unknown(block_type, action_data.get("Identifier"))
+                if verbose:
+                    print(f"[WARNING] Unknown block type: {block_type}")
+                    print(f"   Block data: {json.dumps(action_data, indent=2)}\n")
             
             block_class = cls.BLOCK_TYPE_MAP.get(block_type, FlowBlock)
-            block = block_class.from_dict(action_data)
-            actions.append(block)
+            if lazy:
+                actions.append(LazyBlock(action_data, block_class))
+            else:
+                actions.append(block_class.from_dict(action_data))
         
-        if unknown_types:
-            print(f"[SUMMARY] Found {len(unknown_types)} unknown block type(s): {', '.join(sorted(unknown_types))}\n")
+        diagnostics.action_count = len(actions)
+        if verbose and diagnostics.has_unknown_blocks:
+            unknown_types = diagnostics.unknown_type_counts
+            print(f"[SUMMARY] Found {len(unknown_types)} unknown block type(s): {', '.join(sorted(map(str, unknown_types)))}\n")
         
         flow = ContactFlow(
             version=flow_json.get("Version", "2019-10-30"),
@@ -94,14 +207,34 @@ class FlowDecompiler:
             actions=actions
         )
         
-        return flow, len(unknown_types) > 0
+        return flow, diagnostics
 
     @classmethod
-    def decompile_from_file(cls, filepath: str) -> tuple[ContactFlow, bool]:
+    def decompile(cls, flow_json: dict, verbose: bool = False, lazy: bool = False) -> tuple[ContactFlow, bool]:
         """
-        Load and decompile a contact flow from a JSON file.
+        Parse AWS Connect JSON into a ContactFlow object.
         Returns tuple of (ContactFlow, has_unknown_blocks)
         """
+        flow, diagnostics = cls.decompile_with_diagnostics(flow_json, verbose, lazy)
+        return flow, diagnostics.has_unknown_blocks
+
+    @classmethod
+    def decompile_file_with_diagnostics(cls, filepath: str, verbose: bool = False,
+                                        lazy: bool = False) -> tuple[ContactFlow, DecompileDiagnostics]:
+        """
+        Load and decompile a contact flow from a JSON file.
+        Returns tuple of (ContactFlow, DecompileDiagnostics)
+        """
         with open(filepath, 'r') as f:
-            flow_json = json.load(f)
-        return cls.decompile(flow_json)
+            flow_json = json_backend.load(f)
+        return cls.decompile_with_diagnostics(flow_json, verbose, lazy)
+
+    @classmethod
+    def decompile_from_file(cls, filepath: str, verbose: bool = False,
+                            lazy: bool = False) -> tuple[ContactFlow, bool]:
+        """
+        Load and decompile a contact flow from a JSON file.
+        Returns tuple of (ContactFlow, has_unknown_blocks)
+        """
+        flow, diagnostics = cls.decompile_file_with_diagnostics(filepath, verbose, lazy)
+        return flow, diagnostics.has_unknown_blocks
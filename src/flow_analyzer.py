@@ -0,0 +1,113 @@
+"""
+Flow Analyzer - Linear-time structural checks on a flow's transition graph.
+
+Builds one FlowGraph and reports, in O(blocks + transitions):
+  - unreachable blocks (no path from StartAction)
+  - dead ends: blocks that are not terminal but have no transitions
+  - the validator's structural rules (FlowValidator.start_action_issues and
+    transition_issues): a missing StartAction, dangling NextAction /
+    Condition / Error targets, and blocks missing error branches their type
+    requires (e.g. NoMatchingError)
+
+Works on a ContactFlowBuilder without compiling it, so thousands of flows
+can be gated in CI in seconds.
+
+Usage: python flow_analyzer.py <flow_file.json> [...]
+"""
+import json_backend
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List
+from decompiler import FlowDecompiler
+from flow_graph import FlowGraph
+from validator import FlowValidator, ValidationIssue, check_files
+
+
+# Block types that end the flow (or hand the contact off), so need no transitions
+TERMINAL_TYPES = frozenset({
+    "DisconnectParticipant",
+    "EndFlowExecution",
+    "TransferToFlow",
+    "TransferContactToQueue",
+})
+
+
+@dataclass
+class FlowAnalysis:
+    """Structural problems found in one flow."""
+    blocks: int = 0
+    start_missing: bool = False     # StartAction empty or not a block in the flow
+    unreachable: List[str] = field(default_factory=list)
+    dead_ends: List[str] = field(default_factory=list)
+    # Missing StartAction, dangling transitions and missing required error
+    # branches, from the validator's rules
+    structural_issues: List[ValidationIssue] = field(default_factory=list)
+    block_types: Dict[str, str] = field(default_factory=dict)  # Reported identifier -> type
+
+    @property
+    def is_clean(self) -> bool:
+        return not self.issues()
+
+    def issues(self) -> List[ValidationIssue]:
+        """Validator errors first, then dead ends and unreachable blocks as warnings."""
+        issues = list(self.structural_issues)
+        for identifier in self.dead_ends:
+            issues.append(ValidationIssue(
+                "warning", f"{self.block_types[identifier]} has no transitions and does not end the flow", identifier))
+        if not self.start_missing:
+            for identifier in self.unreachable:
+                issues.append(ValidationIssue("warning", "Unreachable from StartAction", identifier))
+        return issues
+
+
+class FlowAnalyzer:
+    """Analyze flows given as ContactFlow, ContactFlowBuilder or JSON dict."""
+
+    @classmethod
+    def analyze(cls, flow) -> FlowAnalysis:
+        """Run every structural check in one pass over the flow's graph."""
+        if isinstance(flow, dict):
+            flow, _ = FlowDecompiler.decompile(flow, lazy=True)
+        graph = FlowGraph.from_flow(flow)
+        blocks = graph.blocks
+        ids = graph.ids
+
+        result = FlowAnalysis(blocks=len(blocks), start_missing=graph.start is None)
+        result.structural_issues.extend(
+            FlowValidator.start_action_issues(graph.start_action, graph.index, bool(blocks)))
+
+        reachable = graph.reachable()
+        offsets = graph.succ_offsets
+        has_transitions = [False] * len(blocks)
+        for node, _, _ in graph.dangling:
+            has_transitions[node] = True
+
+        for node, block in enumerate(blocks):
+            identifier = ids[node]
+            if not reachable[node]:
+                result.unreachable.append(identifier)
+                result.block_types[identifier] = block.type
+
+            if (offsets[node] == offsets[node + 1] and not has_transitions[node]
+                    and block.type not in TERMINAL_TYPES):
+                result.dead_ends.append(identifier)
+                result.block_types[identifier] = block.type
+
+            result.structural_issues.extend(FlowValidator.transition_issues(
+                {"Identifier": identifier, "Type": block.type,
+                 "Parameters": block.parameters, "Transitions": block.transitions},
+                graph.index))
+
+        return result
+
+    @classmethod
+    def analyze_file(cls, filepath: str) -> FlowAnalysis:
+        """Load and analyze a flow JSON file."""
+        with open(filepath, 'r') as f:
+            flow_json = json_backend.load(f)
+        return cls.analyze(flow_json)
+
+
+if __name__ == "__main__":
+    sys.exit(check_files(sys.argv, lambda filepath: FlowAnalyzer.analyze_file(filepath).issues(),
+                         ("Passed", "Failed")))
@@ -0,0 +1,289 @@
+"""
+Flow Diff - Semantic comparison of two contact flows.
+
+Blocks are matched by identifier, then structurally: blocks whose type,
+parameters and neighbourhood hash the same are paired even when their
+identifiers differ (e.g. an instance export vs. a regenerated flow).
+Identical pairs are pruned by equality; the rest are reported as added,
+removed and changed blocks with their parameter and transition changes.
+Metadata (layout) is ignored.
+
+Unchanged regions are not pruned by subtree hash: hashing a block's
+content costs about ten times comparing the two dicts, and a subtree
+hash needs every block hashed, so it could not skip work that one
+equality check per matched block does not already avoid. Neighbourhood
+hashes are only computed when some identifiers have no match.
+
+Usage: python flow_diff.py <old_flow.json> <new_flow.json>
+"""
+import json_backend
+import sys
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from canonical import canonical_json
+
+
+# Transition label -> target identifier, in transition order
+Edges = List[Tuple[str, Optional[str]]]
+
+
+def transition_edges(action: dict) -> Edges:
+    """Labelled transitions of an action, e.g. ("Condition Equals 1", target)."""
+    transitions = action.get("Transitions", {})
+    edges = []
+    if transitions.get("NextAction"):
+        edges.append(("NextAction", transitions["NextAction"]))
+    for c in transitions.get("Conditions", []):
+        condition = c.get("Condition", {})
+        operands = ",".join(str(operand) for operand in condition.get("Operands", []))
+        edges.append((f"Condition {condition.get('Operator', '')} {operands}", c.get("NextAction")))
+    for e in transitions.get("Errors", []):
+        edges.append((f"Error {e.get('ErrorType', '')}", e.get("NextAction")))
+    return edges
+
+
+@dataclass
+class BlockChange:
+    """Differences between two matched blocks."""
+    identifier: str                 # In the old flow
+    new_identifier: str             # In the new flow (differs when matched structurally)
+    type: str
+    new_type: str
+    parameters: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)  # key -> (old, new); None if absent
+    transitions_added: Edges = field(default_factory=list)     # Targets as old-flow ids where matched
+    transitions_removed: Edges = field(default_factory=list)
+
+    def __str__(self) -> str:
+        parts = []
+        if self.type != self.new_type:
+            parts.append(f"type {self.type} -> {self.new_type}")
+        if self.parameters:
+            parts.append(f"parameters {', '.join(self.parameters)}")
+        parts += [f"+{label} -> {target}" for label, target in self.transitions_added]
+        parts += [f"-{label} -> {target}" for label, target in self.transitions_removed]
+        renamed = f" (now {self.new_identifier})" if self.new_identifier != self.identifier else ""
+        return f"~ {self.identifier}{renamed} [{self.new_type}]: {'; '.join(parts)}"
+
+
+@dataclass
+class FlowDiff:
+    """Semantic differences between an old and a new flow."""
+    added: List[str] = field(default_factory=list)     # New-flow ids with no match
+    removed: List[str] = field(default_factory=list)   # Old-flow ids with no match
+    changed: List[BlockChange] = field(default_factory=list)
+    renamed: Dict[str, str] = field(default_factory=dict)  # Old id -> new id, matched structurally
+    start_action: Optional[Tuple[str, str]] = None      # (old, new) when it changed
+    version: Optional[Tuple[str, str]] = None
+    block_types: Dict[str, str] = field(default_factory=dict)  # Added/removed id -> type
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.changed or self.start_action or self.version)
+
+    def summary(self) -> str:
+        """Human-readable listing of the differences."""
+        lines = []
+        if self.version:
+            lines.append(f"Version: {self.version[0]} -> {self.version[1]}")
+        if self.start_action:
+            lines.append(f"StartAction: {self.start_action[0]} -> {self.start_action[1]}")
+        lines += [f"- {block_id} [{self.block_types[block_id]}]" for block_id in self.removed]
+        lines += [f"+ {block_id} [{self.block_types[block_id]}]" for block_id in self.added]
+        lines += [str(change) for change in self.changed]
+        lines.append(f"{len(self.added)} added, {len(self.removed)} removed, {len(self.changed)} changed"
+                     f" ({len(self.renamed)} matched by structure)")
+        return "\n".join(lines)
+
+
+class FlowDiffer:
+    """Compare flows given as JSON dict, ContactFlow or ContactFlowBuilder."""
+
+    # Neighbourhood rounds hashed for structural matching
+    STRUCTURE_ROUNDS = 3
+
+    @classmethod
+    def diff(cls, old, new) -> FlowDiff:
+        """Semantic diff from old to new."""
+        old, new = cls._as_dict(old), cls._as_dict(new)
+        old_actions = {a.get("Identifier"): a for a in old.get("Actions", [])}
+        new_actions = {a.get("Identifier"): a for a in new.get("Actions", [])}
+
+        result = FlowDiff()
+        if old.get("Version") != new.get("Version"):
+            result.version = (old.get("Version"), new.get("Version"))
+
+        # Old id -> new id
+        matches = {block_id: block_id for block_id in old_actions if block_id in new_actions}
+        cls._match_structurally(old_actions, new_actions, matches)
+        result.renamed = {old_id: new_id for old_id, new_id in matches.items() if old_id != new_id}
+        to_old = {new_id: old_id for old_id, new_id in matches.items()}
+
+        old_start, new_start = old.get("StartAction", ""), new.get("StartAction", "")
+        if matches.get(old_start, old_start) != new_start:
+            result.start_action = (old_start, new_start)
+
+        for old_id, new_id in matches.items():
+            old_action, new_action = old_actions[old_id], new_actions[new_id]
+            if old_id == new_id and old_action == new_action:
+                continue  # Identical, nothing to compare (one dict comparison per block)
+            change = cls._compare(old_action, new_action, to_old)
+            if change:
+                result.changed.append(change)
+
+        result.removed = [block_id for block_id in old_actions if block_id not in matches]
+        result.added = [block_id for block_id in new_actions if block_id not in to_old]
+        result.block_types = {block_id: old_actions[block_id].get("Type") for block_id in result.removed}
+        result.block_types.update({block_id: new_actions[block_id].get("Type") for block_id in result.added})
+        return result
+
+    @staticmethod
+    def _as_dict(flow) -> dict:
+        if hasattr(flow, "compile"):
+            return flow.compile()
+        if hasattr(flow, "to_dict"):
+            return flow.to_dict()
+        return flow
+
+    @classmethod
+    def _structure_hashes(cls, actions: Dict[str, dict], edges: Dict[str, Edges]) -> List[Dict[str, int]]:
+        """Per-round hashes: round 0 is the block itself, round k adds k steps of successors."""
+        current = {
+            block_id: hash((action.get("Type"), canonical_json(action.get("Parameters", {})),
+                            tuple(label for label, _ in edges[block_id])))
+            for block_id, action in actions.items()
+        }
+        rounds = [current]
+        for _ in range(cls.STRUCTURE_ROUNDS):
+            current = {
+                block_id: hash((current[block_id],
+                                tuple((label, current.get(target)) for label, target in edges[block_id])))
+                for block_id in actions
+            }
+            rounds.append(current)
+        return rounds
+
+    @classmethod
+    def _match_structurally(cls, old_actions: Dict[str, dict], new_actions: Dict[str, dict],
+                            matches: Dict[str, str]):
+        """Pair unmatched blocks with unique equal hashes, then follow matched edges."""
+        if len(matches) == len(old_actions) or len(matches) == len(new_actions):
+            return
+        old_edges = {block_id: transition_edges(action) for block_id, action in old_actions.items()}
+        new_edges = {block_id: transition_edges(action) for block_id, action in new_actions.items()}
+        old_hashes = cls._structure_hashes(old_actions, old_edges)
+        new_hashes = cls._structure_hashes(new_actions, new_edges)
+        matched_new = set(matches.values())
+
+        old_preds = defaultdict(list)  # Target -> [(label, source)]
+        for source, edges in old_edges.items():
+            for label, target in edges:
+                old_preds[target].append((label, source))
+        new_preds = defaultdict(list)
+        for source, edges in new_edges.items():
+            for label, target in edges:
+                new_preds[target].append((label, source))
+
+        def match(old_id: str, new_id: str, pairs: List[Tuple[str, str]]):
+            matches[old_id] = new_id
+            matched_new.add(new_id)
+            pairs.append((old_id, new_id))
+
+        def propagate(pairs: List[Tuple[str, str]]):
+            # Neighbours of a matched pair reached by the same label are the
+            # same block (possibly edited) if their types agree. Predecessors
+            # must also be the only such candidate on each side.
+            while pairs:
+                old_id, new_id = pairs.pop()
+                new_targets = dict(new_edges[new_id])
+                for label, old_target in old_edges[old_id]:
+                    new_target = new_targets.get(label)
+                    if (old_target in old_actions and new_target in new_actions
+                            and old_target not in matches and new_target not in matched_new
+                            and old_actions[old_target].get("Type") == new_actions[new_target].get("Type")):
+                        match(old_target, new_target, pairs)
+
+                old_sources = defaultdict(list)
+                for label, source in old_preds.get(old_id, ()):
+                    if source not in matches:
+                        old_sources[label, old_actions[source].get("Type")].append(source)
+                new_sources = defaultdict(list)
+                for label, source in new_preds.get(new_id, ()):
+                    if source not in matched_new:
+                        new_sources[label, new_actions[source].get("Type")].append(source)
+                for key, sources in old_sources.items():
+                    others = new_sources.get(key, ())
+                    if len(sources) == 1 and len(others) == 1:
+                        match(sources[0], others[0], pairs)
+
+        propagate(list(matches.items()))
+
+        # Most specific hashes first, so a pair is only matched on weak
+        # evidence when stronger rounds could not tell blocks apart
+        for level in range(cls.STRUCTURE_ROUNDS, -1, -1):
+            groups = defaultdict(lambda: ([], []))
+            for block_id, value in old_hashes[level].items():
+                if block_id not in matches:
+                    groups[value][0].append(block_id)
+            for block_id, value in new_hashes[level].items():
+                if block_id not in matched_new:
+                    groups[value][1].append(block_id)
+
+            found: List[Tuple[str, str]] = []
+            for old_ids, new_ids in groups.values():
+                if len(old_ids) == 1 and len(new_ids) == 1:
+                    match(old_ids[0], new_ids[0], found)
+            propagate(found)
+
+    @staticmethod
+    def _compare(old_action: dict, new_action: dict, to_old: Dict[str, str]) -> Optional[BlockChange]:
+        """Differences between matched actions, with new targets mapped to old ids."""
+        change = BlockChange(
+            identifier=old_action.get("Identifier"),
+            new_identifier=new_action.get("Identifier"),
+            type=old_action.get("Type"),
+            new_type=new_action.get("Type"),
+        )
+
+        old_params = old_action.get("Parameters", {})
+        new_params = new_action.get("Parameters", {})
+        for key in list(old_params) + [key for key in new_params if key not in old_params]:
+            if canonical_json(old_params.get(key)) != canonical_json(new_params.get(key)):
+                change.parameters[key] = (old_params.get(key), new_params.get(key))
+
+        old_edges = transition_edges(old_action)
+        new_edges = [(label, to_old.get(target, target)) for label, target in transition_edges(new_action)]
+        unmatched = Counter(old_edges)
+        for edge in new_edges:
+            if unmatched[edge]:
+                unmatched[edge] -= 1
+            else:
+                change.transitions_added.append(edge)
+        for edge in old_edges:
+            if unmatched[edge]:
+                unmatched[edge] -= 1
+                change.transitions_removed.append(edge)
+
+        if (change.type == change.new_type and not change.parameters
+                and not change.transitions_added and not change.transitions_removed):
+            return None
+        return change
+
+    @classmethod
+    def diff_files(cls, old_path: str, new_path: str) -> FlowDiff:
+        """Load and diff two flow JSON files."""
+        with open(old_path, 'r') as f:
+            old = json_backend.load(f)
+        with open(new_path, 'r') as f:
+            new = json_backend.load(f)
+        return cls.diff(old, new)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print(f"Usage: {sys.argv[0]} <old_flow.json> <new_flow.json>")
+        sys.exit(2)
+
+    flow_diff = FlowDiffer.diff_files(sys.argv[1], sys.argv[2])
+    print(flow_diff.summary())
+    sys.exit(1 if not flow_diff.is_empty else 0)
@@ -0,0 +1,334 @@
+"""
+Flow Graph - Integer-indexed transition graph of a contact flow.
+
+Built in a single pass over block transitions and shared by layout and
+analysis code, so no phase has to re-walk the transitions dictionaries.
+"""
+from typing import List, Dict, Optional, Tuple, Iterable
+from blocks.base import FlowBlock
+
+
+class FlowGraph:
+    """Compressed (CSR) successor/predecessor arrays over a list of blocks.
+
+    Node i is blocks[i]. The successors of node i are
+    succ_targets[succ_offsets[i]:succ_offsets[i + 1]] with matching entries
+    in succ_kinds, in transition order: NextAction, then Conditions, then
+    Errors. Predecessor arrays are ordered by source node, then edge order.
+
+    Transitions that point at identifiers with no block are not edges; they
+    are recorded in dangling as (source node, target id, kind).
+    """
+
+    NEXT = 0
+    CONDITION = 1
+    ERROR = 2
+    EDGE_KINDS = ("next", "condition", "error")
+
+    def __init__(self, blocks: List[FlowBlock], start_action: Optional[str] = None):
+        self.blocks = blocks
+        self.ids: List[str] = [block.identifier for block in blocks]
+        self.index: Dict[str, int] = {block_id: i for i, block_id in enumerate(self.ids)}
+        self.start_action = start_action
+        self.start: Optional[int] = self.index.get(start_action) if start_action else None
+
+        self.succ_offsets: List[int] = [0]
+        self.succ_targets: List[int] = []
+        self.succ_kinds: List[int] = []
+        self.branch_counts: List[int] = []  # Condition + error entries per block
+        self.dangling: List[Tuple[int, str, int]] = []
+
+        self._build_successors()
+        self._build_predecessors()
+        self._back_edges: Optional[List[bool]] = None
+        self._reachable: Optional[List[bool]] = None
+
+    def _build_successors(self):
+        """Walk every block's transitions once to fill the successor arrays."""
+        index = self.index
+        targets = self.succ_targets
+        kinds = self.succ_kinds
+
+        for node, block in enumerate(self.blocks):
+            transitions = block.transitions
+            conditions = transitions.get("Conditions", [])
+            errors = transitions.get("Errors", [])
+
+            edges = []
+            if transitions.get("NextAction"):
+                edges.append((transitions["NextAction"], self.NEXT))
+            edges.extend((c["NextAction"], self.CONDITION) for c in conditions if c.get("NextAction"))
+            edges.extend((e["NextAction"], self.ERROR) for e in errors if e.get("NextAction"))
+
+            for target_id, kind in edges:
+                target = index.get(target_id)
+                if target is None:
+                    self.dangling.append((node, target_id, kind))
+                else:
+                    targets.append(target)
+                    kinds.append(kind)
+
+            self.succ_offsets.append(len(targets))
+            self.branch_counts.append(len(conditions) + len(errors))
+
+    def _build_predecessors(self):
+        """Invert the successor arrays with a counting sort."""
+        n = len(self.blocks)
+        counts = [0] * (n + 1)
+        for target in self.succ_targets:
+            counts[target + 1] += 1
+        for i in range(n):
+            counts[i + 1] += counts[i]
+        self.pred_offsets: List[int] = counts[:]
+
+        self.pred_sources: List[int] = [0] * len(self.succ_targets)
+        self.pred_kinds: List[int] = [0] * len(self.succ_targets)
+        self.pred_edges: List[int] = [0] * len(self.succ_targets)  # Successor edge index
+        fill = counts
+        offsets = self.succ_offsets
+        for source in range(n):
+            for e in range(offsets[source], offsets[source + 1]):
+                target = self.succ_targets[e]
+                slot = fill[target]
+                self.pred_sources[slot] = source
+                self.pred_kinds[slot] = self.succ_kinds[e]
+                self.pred_edges[slot] = e
+                fill[target] = slot + 1
+
+    @classmethod
+    def from_flow(cls, flow) -> 'FlowGraph':
+        """Build a graph from a ContactFlow or ContactFlowBuilder."""
+        if hasattr(flow, "actions"):
+            return cls(flow.actions, flow.start_action)
+        return cls(flow.blocks, flow._start_action)
+
+    def __len__(self) -> int:
+        return len(self.blocks)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.succ_targets)
+
+    def successors(self, node: int) -> List[int]:
+        """Target nodes of node's transitions, in transition order."""
+        return self.succ_targets[self.succ_offsets[node]:self.succ_offsets[node + 1]]
+
+    def predecessors(self, node: int) -> List[int]:
+        """Source nodes of transitions into node, in source order."""
+        return self.pred_sources[self.pred_offsets[node]:self.pred_offsets[node + 1]]
+
+    def out_edges(self, node: int) -> Iterable[Tuple[int, int]]:
+        """(target, kind) pairs for node's transitions."""
+        start, end = self.succ_offsets[node], self.succ_offsets[node + 1]
+        return zip(self.succ_targets[start:end], self.succ_kinds[start:end])
+
+    def in_edges(self, node: int) -> Iterable[Tuple[int, int]]:
+        """(source, kind) pairs for transitions into node."""
+        start, end = self.pred_offsets[node], self.pred_offsets[node + 1]
+        return zip(self.pred_sources[start:end], self.pred_kinds[start:end])
+
+    def back_edges(self) -> List[bool]:
+        """Per successor edge, whether it closes a cycle (a DFS back edge).
+
+        One iterative DFS from the start node, then from every node not yet
+        visited, in O(V + E) and without recursion. Removing the back edges
+        leaves an acyclic skeleton with the same reachability from start.
+        """
+        if self._back_edges is None:
+            n = len(self.blocks)
+            offsets = self.succ_offsets
+            targets = self.succ_targets
+            flags = [False] * len(targets)
+            state = [0] * n  # 0 unvisited, 1 on the DFS stack, 2 finished
+
+            roots = [self.start] if self.start is not None else []
+            for root in roots + list(range(n)):
+                if state[root]:
+                    continue
+                state[root] = 1
+                nodes = [root]
+                next_edge = [offsets[root]]
+                while nodes:
+                    node = nodes[-1]
+                    e = next_edge[-1]
+                    if e == offsets[node + 1]:
+                        state[node] = 2
+                        nodes.pop()
+                        next_edge.pop()
+                        continue
+                    next_edge[-1] = e + 1
+                    target = targets[e]
+                    if state[target] == 0:
+                        state[target] = 1
+                        nodes.append(target)
+                        next_edge.append(offsets[target])
+                    elif state[target] == 1:
+                        flags[e] = True
+
+            self._back_edges = flags
+        return self._back_edges
+
+    def forward_successors(self, node: int) -> List[int]:
+        """Successors of node over edges that are not back edges."""
+        back = self.back_edges()
+        return [self.succ_targets[e] for e in range(self.succ_offsets[node], self.succ_offsets[node + 1])
+                if not back[e]]
+
+    def forward_predecessors(self, node: int) -> List[int]:
+        """Predecessors of node over edges that are not back edges."""
+        back = self.back_edges()
+        return [self.pred_sources[slot] for slot in range(self.pred_offsets[node], self.pred_offsets[node + 1])
+                if not back[self.pred_edges[slot]]]
+
+    def strong_components(self) -> List[int]:
+        """Per node, the index of its strongly connected component.
+
+        Iterative Tarjan in O(V + E). Components are numbered in reverse
+        topological order: every edge between components goes from a higher
+        index to a lower one.
+        """
+        n = len(self.blocks)
+        offsets = self.succ_offsets
+        targets = self.succ_targets
+        component = [-1] * n
+        order = [-1] * n  # DFS discovery index
+        low = [0] * n
+        stack: List[int] = []
+        on_stack = [False] * n
+        count = 0
+        num_components = 0
+
+        for root in range(n):
+            if order[root] != -1:
+                continue
+            order[root] = low[root] = count
+            count += 1
+            stack.append(root)
+            on_stack[root] = True
+            nodes = [root]
+            next_edge = [offsets[root]]
+            while nodes:
+                node = nodes[-1]
+                e = next_edge[-1]
+                if e < offsets[node + 1]:
+                    next_edge[-1] = e + 1
+                    target = targets[e]
+                    if order[target] == -1:
+                        order[target] = low[target] = count
+                        count += 1
+                        stack.append(target)
+                        on_stack[target] = True
+                        nodes.append(target)
+                        next_edge.append(offsets[target])
+                    elif on_stack[target] and order[target] < low[node]:
+                        low[node] = order[target]
+                    continue
+
+                nodes.pop()
+                next_edge.pop()
+                if nodes and low[node] < low[nodes[-1]]:
+                    low[nodes[-1]] = low[node]
+                if low[node] == order[node]:
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component[member] = num_components
+                        if member == node:
+                            break
+                    num_components += 1
+        return component
+
+    def reachable(self) -> List[bool]:
+        """Per node, whether it can be reached from the start node."""
+        if self._reachable is None:
+            seen = [False] * len(self.blocks)
+            if self.start is not None:
+                seen[self.start] = True
+                stack = [self.start]
+                offsets = self.succ_offsets
+                targets = self.succ_targets
+                while stack:
+                    node = stack.pop()
+                    for target in targets[offsets[node]:offsets[node + 1]]:
+                        if not seen[target]:
+                            seen[target] = True
+                            stack.append(target)
+            self._reachable = seen
+        return self._reachable
+
+    def unreachable(self) -> List[int]:
+        """Nodes that cannot be reached from the start node, in node order."""
+        reachable = self.reachable()
+        return [node for node in range(len(self.blocks)) if not reachable[node]]
+
+    def entry_points(self, nodes: List[int], forward: bool = False) -> List[int]:
+        """Nodes from which every node in nodes can be reached within nodes.
+
+        Nodes with no predecessor in nodes come first, then one node for
+        each cycle that cannot be entered otherwise. With forward=True only
+        edges that are not back edges count, as for cycle-aware layout.
+        Linear in the size of the subgraph.
+        """
+        member = [False] * len(self.blocks)
+        for node in nodes:
+            member[node] = True
+        offsets = self.succ_offsets
+        targets = self.succ_targets
+        pred_offsets = self.pred_offsets
+        pred_sources = self.pred_sources
+        pred_edges = self.pred_edges
+        back = self.back_edges() if forward else None
+
+        entries = [node for node in nodes
+                   if not any(member[pred_sources[slot]] and not (back and back[pred_edges[slot]])
+                              for slot in range(pred_offsets[node], pred_offsets[node + 1]))]
+        num_sources = len(entries)
+        seen = [False] * len(self.blocks)
+        for i, root in enumerate(entries[:num_sources] + nodes):
+            if seen[root]:
+                continue
+            if i >= num_sources:
+                entries.append(root)
+            seen[root] = True
+            stack = [root]
+            while stack:
+                node = stack.pop()
+                for e in range(offsets[node], offsets[node + 1]):
+                    target = targets[e]
+                    if member[target] and not seen[target] and not (back and back[e]):
+                        seen[target] = True
+                        stack.append(target)
+        return entries
+
+    def components(self, nodes: List[int]) -> List[List[int]]:
+        """Connected components of the subgraph on nodes, ignoring edge direction.
+
+        One sweep over nodes in order, visiting each node and edge once.
+        Components are ordered by their first node.
+        """
+        member = [False] * len(self.blocks)
+        for node in nodes:
+            member[node] = True
+        offsets = self.succ_offsets
+        targets = self.succ_targets
+        pred_offsets = self.pred_offsets
+        pred_sources = self.pred_sources
+
+        components = []
+        for root in nodes:
+            if not member[root]:
+                continue
+            member[root] = False  # Cleared once placed in a component
+            component = [root]
+            stack = [root]
+            while stack:
+                node = stack.pop()
+                for neighbours in (targets[offsets[node]:offsets[node + 1]],
+                                   pred_sources[pred_offsets[node]:pred_offsets[node + 1]]):
+                    for other in neighbours:
+                        if member[other]:
+                            member[other] = False
+                            component.append(other)
+                            stack.append(other)
+            components.append(component)
+        return components
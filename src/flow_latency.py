@@ -0,0 +1,270 @@
+"""
+Flow Latency - Worst-case and typical caller wait up to each terminal block.
+
+Timeouts are spread over block parameters (GetParticipantInput,
+ConnectParticipantWithLexBot, InvokeLambdaFunction, ShowView, Wait). For
+every terminal block reachable from StartAction (queue transfer,
+disconnect, TransferToFlow, ...) the analyzer reports the longest
+cumulative wait along any path, in O(blocks + transitions):
+  - worst case: every timed block runs to its time limit, and every loop
+    (strongly connected component) repeats its blocks up to loop_bound times
+  - typical: answered inputs and successful invocations take
+    typical_fraction of their time limit, timeout branches the full limit,
+    and loops run once
+
+Both are longest-path DP over the acyclic skeleton (FlowGraph.back_edges),
+so time-to-agent budgets can be gated before deploy.
+
+Example:
+    report = FlowLatencyAnalyzer.analyze(flow, LatencyModel(loop_bound=3))
+    for issue in report.issues(budget_seconds=120):
+        print(issue)
+
+Usage: python flow_latency.py [--budget SECONDS] <flow_file.json> [...]
+"""
+import argparse
+import sys
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from blocks.base import FlowBlock
+from decompiler import FlowDecompiler
+from flow_analyzer import TERMINAL_TYPES
+from flow_graph import FlowGraph
+from flow_stream import FlowStream
+from validator import ValidationIssue
+
+
+class BlockTimeout(NamedTuple):
+    """Where a block type keeps its time limit."""
+    parameter: str
+    default: float                  # Seconds, when the parameter is absent or not a number
+    timeout_error: Optional[str]    # Error branch taken when the limit is reached
+    waits_full: bool = False        # Always waits the whole limit (no early answer)
+
+
+BLOCK_TIMEOUTS = {
+    "GetParticipantInput": BlockTimeout("InputTimeLimitSeconds", 5.0, "InputTimeLimitExceeded"),
+    "ConnectParticipantWithLexBot": BlockTimeout("LexTimeoutSeconds", 5.0, "InputTimeLimitExceeded"),
+    "InvokeLambdaFunction": BlockTimeout("InvocationTimeLimitSeconds", 8.0, "NoMatchingError"),
+    "ShowView": BlockTimeout("InvocationTimeLimitSeconds", 400.0, "TimeLimitExceeded"),
+    "Wait": BlockTimeout("TimeLimitSeconds", 60.0, None, waits_full=True),
+}
+
+
+@dataclass
+class LatencyModel:
+    """Assumptions behind the latency figures."""
+    typical_fraction: float = 0.5   # Share of a time limit an answered/successful block takes
+    loop_bound: int = 3             # Times a loop's blocks may run in the worst case
+    loop_bounds: Dict[str, int] = field(default_factory=dict)  # Identifier of any block in a loop -> bound
+    block_seconds: Dict[str, float] = field(default_factory=dict)  # Fixed seconds per block type, e.g. prompts
+
+
+@dataclass
+class TerminalLatency:
+    """Cumulative caller wait on arriving at (and running) one terminal block."""
+    identifier: str
+    block_type: str
+    worst_seconds: float
+    typical_seconds: float
+    worst_path: List[str]  # Identifiers from StartAction, loops shown once
+
+
+@dataclass
+class LatencyReport:
+    """Latency of every terminal block reachable from StartAction."""
+    terminals: List[TerminalLatency] = field(default_factory=list)
+    loops: List[List[str]] = field(default_factory=list)  # Identifiers of each reachable loop
+    unresolved: List[str] = field(default_factory=list)   # Timeouts that are not numbers; type default used
+
+    def worst(self, block_types: Optional[Iterable[str]] = None) -> Optional[TerminalLatency]:
+        """Terminal with the highest worst case, optionally only of some block types."""
+        types = set(block_types) if block_types is not None else None
+        candidates = [t for t in self.terminals if types is None or t.block_type in types]
+        return max(candidates, key=lambda t: t.worst_seconds, default=None)
+
+    def over_budget(self, budget_seconds: float,
+                    block_types: Iterable[str] = ("TransferContactToQueue",)) -> List[TerminalLatency]:
+        """Terminals of the given types whose worst case exceeds the budget."""
+        types = set(block_types)
+        return [t for t in self.terminals if t.block_type in types and t.worst_seconds > budget_seconds]
+
+    def issues(self, budget_seconds: float,
+               block_types: Iterable[str] = ("TransferContactToQueue",)) -> List[ValidationIssue]:
+        """Budget violations as errors, unresolved timeouts as warnings."""
+        issues = [ValidationIssue(
+            "error", f"{t.block_type} worst-case wait {t.worst_seconds:.0f}s exceeds "
+                     f"{budget_seconds:.0f}s budget (typical {t.typical_seconds:.0f}s)", t.identifier)
+            for t in self.over_budget(budget_seconds, block_types)]
+        for identifier in self.unresolved:
+            issues.append(ValidationIssue("warning", "Time limit is not a number, assumed the default", identifier))
+        return issues
+
+
+class FlowLatencyAnalyzer:
+    """Analyze flows given as ContactFlow, ContactFlowBuilder or JSON dict."""
+
+    @classmethod
+    def analyze(cls, flow, model: Optional[LatencyModel] = None) -> LatencyReport:
+        """Longest worst-case and typical waits from StartAction to each terminal block."""
+        if isinstance(flow, dict):
+            flow, _ = FlowDecompiler.decompile(flow, lazy=True)
+        model = model or LatencyModel()
+        graph = FlowGraph.from_flow(flow)
+        report = LatencyReport()
+        if graph.start is None:
+            return report
+
+        n = len(graph)
+        ids = graph.ids
+        offsets = graph.succ_offsets
+        targets = graph.succ_targets
+        kinds = graph.succ_kinds
+        back = graph.back_edges()
+        reachable = graph.reachable()
+
+        # Per block: worst-case and typical seconds, and the node its timeout branch leads to
+        worst_delay = [0.0] * n
+        typical_delay = [0.0] * n
+        full_delay_target = [-1] * n
+        for node, block in enumerate(graph.blocks):
+            if reachable[node]:
+                worst_delay[node], typical_delay[node], full_delay_target[node] = cls._delays(
+                    block, graph, model, report)
+
+        # A loop adds (bound - 1) extra passes over its blocks, counted on entry
+        component = graph.strong_components()
+        members: Dict[int, List[int]] = {}
+        for node in range(n):
+            if reachable[node]:
+                members.setdefault(component[node], []).append(node)
+        loop_extra = [0.0] * (max(component) + 1 if n else 0)
+        for index, nodes in members.items():
+            cyclic = len(nodes) > 1 or nodes[0] in graph.successors(nodes[0])
+            if not cyclic:
+                continue
+            report.loops.append([ids[node] for node in nodes])
+            bound = min((model.loop_bounds[ids[node]] for node in nodes if ids[node] in model.loop_bounds),
+                        default=model.loop_bound)
+            loop_extra[index] = max(bound - 1, 0) * sum(worst_delay[node] for node in nodes)
+
+        # Longest paths over the acyclic skeleton, in topological (Kahn) order
+        indegree = [0] * n
+        for node in range(n):
+            if reachable[node]:
+                for e in range(offsets[node], offsets[node + 1]):
+                    if not back[e]:
+                        indegree[targets[e]] += 1
+
+        worst = [float("-inf")] * n
+        typical = [float("-inf")] * n
+        parent = [-1] * n
+        start = graph.start
+        worst[start] = loop_extra[component[start]]
+        typical[start] = 0.0
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            leave_worst = worst[node] + worst_delay[node]
+            for e in range(offsets[node], offsets[node + 1]):
+                if back[e]:
+                    continue
+                target = targets[e]
+                arrive = leave_worst
+                if component[target] != component[node]:
+                    arrive += loop_extra[component[target]]
+                if arrive > worst[target]:
+                    worst[target] = arrive
+                    parent[target] = node
+                full = kinds[e] == FlowGraph.ERROR and target == full_delay_target[node]
+                arrive = typical[node] + (worst_delay[node] if full else typical_delay[node])
+                if arrive > typical[target]:
+                    typical[target] = arrive
+                indegree[target] -= 1
+                if indegree[target] == 0:
+                    queue.append(target)
+
+        for node, block in enumerate(graph.blocks):
+            if not reachable[node]:
+                continue
+            if block.type not in TERMINAL_TYPES and offsets[node] != offsets[node + 1]:
+                continue
+            path = []
+            step = node
+            while step != -1:
+                path.append(ids[step])
+                step = parent[step]
+            report.terminals.append(TerminalLatency(
+                ids[node], block.type,
+                worst[node] + worst_delay[node],
+                typical[node] + typical_delay[node],
+                path[::-1],
+            ))
+        return report
+
+    @classmethod
+    def _delays(cls, block: FlowBlock, graph: FlowGraph, model: LatencyModel,
+                report: LatencyReport) -> Tuple[float, float, int]:
+        """(worst seconds, typical seconds, node of the timeout branch or -1) for one block."""
+        fixed = model.block_seconds.get(block.type, 0.0)
+        timeout = BLOCK_TIMEOUTS.get(block.type)
+        if timeout is None:
+            return fixed, fixed, -1
+
+        value = block.parameters.get(timeout.parameter)
+        seconds = cls._seconds(value)
+        if seconds is None:
+            if value is not None:
+                report.unresolved.append(block.identifier)
+            seconds = timeout.default
+
+        timeout_target = -1
+        if timeout.timeout_error:
+            for error in block.transitions.get("Errors", []):
+                if error.get("ErrorType") == timeout.timeout_error:
+                    timeout_target = graph.index.get(error.get("NextAction"), -1)
+        typical = seconds if timeout.waits_full else seconds * model.typical_fraction
+        return fixed + seconds, fixed + typical, timeout_target
+
+    @staticmethod
+    def _seconds(value) -> Optional[float]:
+        """A time limit as seconds; dicts such as LexTimeoutSeconds give their largest entry."""
+        values = value.values() if isinstance(value, dict) else [value]
+        seconds = []
+        for item in values:
+            try:
+                seconds.append(float(item))
+            except (TypeError, ValueError):
+                return None
+        return max(seconds, default=None)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Worst-case caller wait per terminal block")
+    parser.add_argument("files", nargs="+", help="Flow JSON files or multi-flow bundles")
+    parser.add_argument("--budget", type=float, help="Fail when a queue transfer can take longer (seconds)")
+    parser.add_argument("--loop-bound", type=int, default=LatencyModel.loop_bound)
+    args = parser.parse_args()
+
+    model = LatencyModel(loop_bound=args.loop_bound)
+    failed_count = 0
+    total = 0
+    for filepath in args.files:
+        for record in FlowStream(filepath).records():
+            total += 1
+            name = record.name or (filepath if record.index == 0 else f"{filepath}[{record.index}]")
+            report = FlowLatencyAnalyzer.analyze(record.flow_json, model)
+            worst = report.worst()
+            summary = (f"worst {worst.worst_seconds:.0f}s, typical {worst.typical_seconds:.0f}s"
+                       if worst else "no reachable terminal")
+            issues = report.issues(args.budget) if args.budget is not None else []
+            errors = [issue for issue in issues if issue.severity == "error"]
+            print(f"{'✗ Failed' if errors else '✓ Passed'}: {name} ({summary}, {len(report.loops)} loops)")
+            for issue in issues:
+                print(f"    {issue}")
+            if errors:
+                failed_count += 1
+
+    print(f"\nResults: {total - failed_count} passed, {failed_count} failed")
+    sys.exit(1 if failed_count else 0)
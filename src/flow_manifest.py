@@ -0,0 +1,89 @@
+"""
+Flow Manifest - Skip rewriting flows whose output has not changed.
+
+Records, per flow name, the canonical content and layout hashes of the last
+file written. ContactFlowBuilder.compile_to_file(path, manifest=...) leaves
+the file untouched when both hashes match, so deploy tooling (e.g.
+Terraform) only sees the flows that actually changed.
+
+Example:
+    manifest = FlowManifest("output/.flow_manifest.json")
+    for flow in flows:
+        flow.compile_to_file(f"output/{flow.name}.json", manifest=manifest)
+    manifest.save()
+    print(manifest.report())
+"""
+import json
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+# Change statuses, as reported per flow
+NEW = "new"                # Not in the manifest before
+CONTENT = "content"        # Actions, StartAction or Version changed
+LAYOUT = "layout"          # Only block positions / canvas metadata changed
+MISSING = "missing"        # Unchanged, but the output file no longer exists
+UNCHANGED = "unchanged"    # File left as is
+
+CHANGED_STATUSES = (NEW, CONTENT, LAYOUT, MISSING)
+
+
+@dataclass
+class ManifestEntry:
+    """Hashes of the last output written for one flow."""
+    output_path: str
+    content_hash: str
+    layout_hash: str
+
+
+class FlowManifest:
+    """Flow name -> hashes of its last written output, persisted as JSON."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path) if path else None
+        self.entries: Dict[str, ManifestEntry] = {}
+        self.changes: Dict[str, str] = {}  # Flow name -> status, for this run
+
+        if self.path and self.path.exists():
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            self.entries = {name: ManifestEntry(**entry) for name, entry in data.get("flows", {}).items()}
+
+    def check(self, name: str, output_path: str, content_hash: str, layout_hash: str) -> str:
+        """Status of a flow's new output against the recorded entry."""
+        entry = self.entries.get(name)
+        if entry is None or entry.output_path != str(output_path):
+            return NEW
+        if entry.content_hash != content_hash:
+            return CONTENT
+        if entry.layout_hash != layout_hash:
+            return LAYOUT
+        if not Path(output_path).exists():
+            return MISSING
+        return UNCHANGED
+
+    def record(self, name: str, output_path: str, content_hash: str, layout_hash: str, status: str):
+        """Store a flow's hashes and its status for this run."""
+        self.entries[name] = ManifestEntry(str(output_path), content_hash, layout_hash)
+        self.changes[name] = status
+
+    def changed(self) -> List[str]:
+        """Names of flows written during this run."""
+        return [name for name, status in self.changes.items() if status in CHANGED_STATUSES]
+
+    def report(self) -> str:
+        """One line per flow checked in this run, then a summary."""
+        lines = [f"  {status:<9} {name}" for name, status in self.changes.items()]
+        lines.append(f"{len(self.changed())} of {len(self.changes)} flows changed")
+        return "\n".join(lines)
+
+    def save(self, path: Optional[str] = None):
+        """Write the manifest (to path, or the path it was loaded from)."""
+        path = Path(path) if path else self.path
+        if path is None:
+            raise ValueError("FlowManifest has no path to save to")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"flows": {name: asdict(entry) for name, entry in sorted(self.entries.items())}}
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
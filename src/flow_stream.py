@@ -0,0 +1,174 @@
+"""
+Flow Stream - Decompile multi-flow bundles one flow at a time.
+
+Reads a file (or any text stream, e.g. stdin) holding many flows as JSON
+lines, as concatenated JSON documents (e.g. `cat input/*.json`) or as one
+top-level JSON array, and yields each flow as soon as it has been read.
+Each document is either flow JSON or a describe-contact-flow response,
+whose ContactFlow.Content string is parsed. Only the flow being decoded and
+one read chunk are held in memory, so multi-GB archives can be processed on
+small runners.
+
+Example:
+    for record in FlowStream("export_bundle.json").flows(lazy=True):
+        print(record.name, len(record.flow.actions))
+
+Usage: python flow_stream.py <bundle_file> (- for stdin)
+"""
+import json
+import re
+import sys
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional, TextIO, Tuple, Union
+import json_backend
+from blocks.base import FlowBlock
+from contact_flow import ContactFlow
+from decompiler import DecompileDiagnostics, FlowDecompiler
+
+
+@dataclass
+class FlowRecord:
+    """One flow read from a stream."""
+    index: int                  # Position in the stream, from 0
+    name: Optional[str]         # ContactFlow.Name, for describe-contact-flow documents
+    flow_type: Optional[str]    # ContactFlow.Type, e.g. CONTACT_FLOW
+    flow_json: dict
+    flow: Optional[ContactFlow] = None
+    diagnostics: Optional[DecompileDiagnostics] = None
+
+
+class FlowStream:
+    """Iterate over the flows in a multi-flow file or text stream."""
+
+    CHUNK_SIZE = 1 << 20  # Characters read at a time
+
+    # Parse errors this close to the end of the buffer may be a document cut
+    # off by the chunk boundary (e.g. inside -Infinity) rather than bad JSON
+    TRUNCATION_WINDOW = 8
+
+    _WHITESPACE = re.compile(r'\s*')
+    _SEPARATORS = re.compile(r'[\s,]*')  # Between elements of a top-level array
+
+    def __init__(self, source: Union[str, Path, TextIO], chunk_size: int = CHUNK_SIZE):
+        self.source = source
+        self.chunk_size = chunk_size
+
+    def documents(self) -> Iterator[dict]:
+        """Top-level JSON objects in the stream, parsed one at a time."""
+        if isinstance(self.source, (str, Path)):
+            if str(self.source) == "-":
+                yield from self._documents(sys.stdin)
+                return
+            with open(self.source, 'r') as f:
+                yield from self._documents(f)
+        else:
+            yield from self._documents(self.source)
+
+    def _documents(self, f: TextIO) -> Iterator[dict]:
+        decoder = json.JSONDecoder()
+        buffer = ""
+        pos = 0
+        offset = 0           # Stream position of buffer[0], for error messages
+        eof = False
+        in_array = None      # Decided by the first non-whitespace character
+
+        while True:
+            skip = self._SEPARATORS if in_array else self._WHITESPACE
+            pos = skip.match(buffer, pos).end()
+            if pos == len(buffer):
+                if eof:
+                    return
+                offset += pos
+                buffer, pos = f.read(self.chunk_size), 0
+                eof = not buffer
+                continue
+
+            if in_array is None:
+                in_array = buffer[pos] == "["
+                pos += in_array
+                continue
+            if in_array and buffer[pos] == "]":
+                in_array = False
+                pos += 1
+                continue
+
+            # JSON lines: a whole document on one line parses with the fast backend
+            end = buffer.find("\n", pos)
+            value = None
+            if end != -1:
+                try:
+                    value = json_backend.loads(buffer[pos:end])
+                except ValueError:
+                    pass
+            if value is None:
+                try:
+                    value, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError as e:
+                    if eof or not self._truncated(e, len(buffer)):
+                        raise ValueError(f"Invalid JSON at offset {offset + e.pos}: {e.msg}") from None
+                    # Incomplete document: read at least as much again, so
+                    # re-parsing a large document stays linear overall
+                    offset += pos
+                    chunk = f.read(max(self.chunk_size, len(buffer) - pos))
+                    buffer, pos = buffer[pos:] + chunk, 0
+                    eof = not chunk
+                    continue
+
+            if not isinstance(value, dict):
+                raise ValueError(f"Expected a JSON object at offset {offset + pos}, got {type(value).__name__}")
+            yield value
+            pos = end
+
+    @classmethod
+    def _truncated(cls, error: json.JSONDecodeError, length: int) -> bool:
+        """Whether a parse error can be explained by the buffer ending mid-document."""
+        return error.pos >= length - cls.TRUNCATION_WINDOW or error.msg.startswith("Unterminated string")
+
+    @staticmethod
+    def _flow_json(document: dict) -> Tuple[Optional[str], Optional[str], dict]:
+        """(name, type, flow JSON) of a flow or describe-contact-flow document."""
+        if "Actions" in document:
+            return None, None, document
+        contact_flow = document.get("ContactFlow", document)
+        content = contact_flow.get("Content")
+        if not isinstance(content, str):
+            raise ValueError("Document is neither flow JSON nor a describe-contact-flow response")
+        return contact_flow.get("Name"), contact_flow.get("Type"), json_backend.loads(content)
+
+    def records(self) -> Iterator[FlowRecord]:
+        """Flow JSON of each document, without decompiling."""
+        for index, document in enumerate(self.documents()):
+            name, flow_type, flow_json = self._flow_json(document)
+            yield FlowRecord(index, name, flow_type, flow_json)
+
+    def flows(self, lazy: bool = False) -> Iterator[FlowRecord]:
+        """Decompiled flows (see FlowDecompiler; lazy gives LazyBlock actions)."""
+        for record in self.records():
+            record.flow, record.diagnostics = FlowDecompiler.decompile_with_diagnostics(record.flow_json, lazy=lazy)
+            yield record
+
+    def actions(self, lazy: bool = False) -> Iterator[Tuple[int, FlowBlock]]:
+        """(flow index, block) for every action of every flow, in stream order."""
+        for record in self.flows(lazy):
+            for action in record.flow.actions:
+                yield record.index, action
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print(f"Usage: {sys.argv[0]} <bundle_file> (- for stdin)")
+        sys.exit(1)
+
+    types = Counter()
+    count = 0
+    for record in FlowStream(sys.argv[1]).flows(lazy=True):
+        count += 1
+        types.update(action.type for action in record.flow.actions)
+        unknown = f", {record.diagnostics.summary()}" if record.diagnostics.has_unknown_blocks else ""
+        print(f"[{record.index}] {record.name or '(unnamed)'}: {len(record.flow.actions)} blocks{unknown}")
+
+    print(f"\n{count} flows, {sum(types.values())} blocks")
+    for block_type, block_count in types.most_common():
+        print(f"  {block_type:<32} {block_count}")
@@ -0,0 +1,162 @@
+"""
+JSON Backend - Fast JSON parsing and encoding, with a stdlib fallback.
+
+Flow JSON is parsed and pretty-printed through the active backend: orjson
+when installed, else the json module. Output is byte-identical between
+backends: orjson's encoding is only used when it cannot differ from
+json.dumps (plain dicts, lists, strings, ints and floats that both write
+in positional form, ASCII-only output); otherwise the value is encoded
+with the stdlib, which also raises TypeError for the same values.
+
+Example:
+    from json_backend import dumps, loads, set_backend
+    flow_json = loads(text)
+    text = dumps(flow_json, indent=2)
+    set_backend("json")  # force the stdlib, e.g. to compare timings
+"""
+import json
+from typing import Any, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # Optional: pip install orjson
+    orjson = None
+
+
+class JsonBackend:
+    """Stdlib json; also the fallback of the faster backends."""
+
+    name = "json"
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return json.loads(data)
+
+    def dumps(self, value: Any, indent: Optional[int] = None) -> str:
+        """Same as json.dumps(value, indent=indent)."""
+        return json.dumps(value, indent=indent)
+
+    def canonical(self, value: Any) -> str:
+        """Same as json.dumps(value, sort_keys=True, separators=(",", ":"))."""
+        return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+class OrjsonBackend(JsonBackend):
+    """orjson for parsing, indent=2 and canonical output; stdlib for the rest."""
+
+    name = "orjson"
+
+    # Besides dataclasses and datetimes (passed to _unsupported), orjson
+    # encodes subclasses of str, int, dict and list itself
+    _OPTIONS = (orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME
+                | orjson.OPT_PASSTHROUGH_SUBCLASS) if orjson is not None else 0
+    _SCALARS = frozenset((str, int, bool, type(None)))
+    # Maps digits to "0" and every other byte to "x", to find runs of digits
+    _DIGITS = bytes(ord("0") if chr(i).isdigit() and i < 128 else ord("x") for i in range(256))
+    _LONG_DIGIT_RUN = b"0" * 19
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        raw = data.encode() if isinstance(data, str) else data
+        # orjson reads integers beyond 64 bits as floats; the stdlib keeps
+        # them exact. 19 digits in a row may be one (or just a long string)
+        if self._LONG_DIGIT_RUN in raw.translate(self._DIGITS):
+            return json.loads(data)
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            return json.loads(data)  # NaN or a real error
+
+    def dumps(self, value: Any, indent: Optional[int] = None) -> str:
+        if indent == 2:
+            encoded = self._encode(value, orjson.OPT_INDENT_2)
+            if encoded is not None:
+                return encoded
+        return json.dumps(value, indent=indent)
+
+    def canonical(self, value: Any) -> str:
+        encoded = self._encode(value, orjson.OPT_SORT_KEYS)
+        if encoded is not None:
+            return encoded
+        return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+    @classmethod
+    def _encode(cls, value: Any, option: int) -> Optional[str]:
+        """orjson's encoding, or None when the stdlib's could differ."""
+        if not cls._plain(value):
+            return None
+        try:
+            encoded = orjson.dumps(value, default=cls._unsupported, option=option | cls._OPTIONS)
+        except TypeError:
+            return None  # Integers beyond 64 bits, non-string keys, ...
+        # The stdlib escapes non-ASCII characters and DEL
+        if not encoded.isascii() or b"\x7f" in encoded:
+            return None
+        return encoded.decode()
+
+    @classmethod
+    def _plain(cls, value: Any) -> bool:
+        """Whether value holds only types orjson writes exactly like the stdlib.
+
+        That excludes UUIDs and enums, which orjson encodes but json.dumps
+        rejects, and floats in exponent form, non-finite or below 1e-4,
+        which orjson spells differently (1e16 vs 1e+16, 0.00001 vs 1e-05).
+        """
+        scalars = cls._SCALARS
+        stack = [value]
+        while stack:
+            item = stack.pop()
+            kind = type(item)
+            if kind is dict:
+                stack.extend(item.values())
+            elif kind is list or kind is tuple:
+                stack.extend(item)
+            elif kind is float:
+                if item and not 1e-4 <= abs(item) < 1e16:
+                    return False
+            elif kind not in scalars:
+                return False
+        return True
+
+    @staticmethod
+    def _unsupported(value: Any):
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+JSON_BACKENDS = {JsonBackend.name: JsonBackend}
+if orjson is not None:
+    JSON_BACKENDS[OrjsonBackend.name] = OrjsonBackend
+
+_backend: JsonBackend = OrjsonBackend() if orjson is not None else JsonBackend()
+
+
+def get_backend() -> JsonBackend:
+    """The active backend."""
+    return _backend
+
+
+def set_backend(name: str):
+    """Switch the active backend by name (one of JSON_BACKENDS)."""
+    global _backend
+    if name not in JSON_BACKENDS:
+        raise ValueError(f"Unknown or unavailable JSON backend {name!r}, "
+                         f"expected one of {', '.join(JSON_BACKENDS)}")
+    _backend = JSON_BACKENDS[name]()
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON text."""
+    return _backend.loads(data)
+
+
+def load(f) -> Any:
+    """Parse JSON from an open file."""
+    return _backend.loads(f.read())
+
+
+def dumps(value: Any, indent: Optional[int] = None) -> str:
+    """Encode like json.dumps(value, indent=indent)."""
+    return _backend.dumps(value, indent)
+
+
+def canonical_dumps(value: Any) -> str:
+    """Compact JSON with sorted keys, like json.dumps(sort_keys=True, separators=(",", ":"))."""
+    return _backend.canonical(value)
@@ -0,0 +1,350 @@
+"""
+Layout Engines - Row assignment within the columns of a flow layout.
+
+A layout engine places each reachable block in a column (its level) and a
+row: the order of blocks within each column and how they line up across
+columns. Rows are compacted and converted to pixel positions by the builder.
+
+Columns are BFS levels from the start block. Cycle-aware engines first find
+the loop (back) edges with one iterative DFS and lay out the acyclic
+skeleton left without them: levels never follow a route through a block's
+own loop, and loop edges such as retry prompts jumping back to their menu
+are left out of row alignment and crossing reduction, drawn separately as
+edges pointing back to the left.
+
+Engines:
+    LayeredBFSLayout  Default. Rows follow discovery order; NextAction
+                      successors stay on their parent's row.
+    SugiyamaLayout    Reorders columns with barycenter (or median) sweeps to
+                      reduce edge crossings, then aligns blocks with their
+                      parents' rows. Cycle-aware by default.
+"""
+from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+from typing import Dict, List, Optional, Tuple
+from flow_graph import FlowGraph
+
+
+class LayoutEngine(ABC):
+    """Assigns a level (column) and a row to every block reachable from start."""
+
+    name = "base"
+    # Whether assign_rows can extend a partial assignment from from_level on
+    supports_incremental = False
+    # Whether levels ignore loop (back) edges, see assign_levels
+    cycle_aware = False
+
+    def assign_levels(self, graph: FlowGraph, roots: Optional[List[int]] = None) -> Dict[int, int]:
+        """Assign each block reachable from start (or from roots) to a level (column).
+
+        Level 0 is the start block, level 1 is blocks reachable in 1 step,
+        etc. Each block gets its shortest path level from start, over the
+        acyclic skeleton (without back edges) when cycle-aware; both reach
+        the same blocks. The returned dict is in BFS discovery order.
+        """
+        if roots is None:
+            if graph.start is None:
+                return {}
+            roots = [graph.start]
+
+        levels = {}
+        queue = deque((root, 0) for root in roots)
+        succ_offsets = graph.succ_offsets
+        succ_targets = graph.succ_targets
+        back = graph.back_edges() if self.cycle_aware else None
+
+        while queue:
+            node, level = queue.popleft()
+
+            # Skip if already assigned (keep shortest path level)
+            if node in levels:
+                continue
+
+            levels[node] = level
+
+            # Add all targets to queue at next level
+            for e in range(succ_offsets[node], succ_offsets[node + 1]):
+                target = succ_targets[e]
+                if target not in levels and not (back and back[e]):
+                    queue.append((target, level + 1))
+
+        return levels
+
+    @abstractmethod
+    def assign_rows(self, graph: FlowGraph, levels: Dict[int, int],
+                    rows: Optional[Dict[int, int]] = None,
+                    from_level: int = 0) -> Dict[int, int]:
+        """Return node -> row for every node in levels (rows may have gaps)."""
+
+
+class LayeredBFSLayout(LayoutEngine):
+    """Rows by discovery order, keeping NextAction chains horizontal.
+
+    With cycle_aware=True, columns come from the acyclic skeleton and loop
+    edges are ignored when lining blocks up with their parents.
+    """
+
+    name = "bfs"
+
+    def __init__(self, cycle_aware: bool = False):
+        self.cycle_aware = cycle_aware
+
+    @property
+    def supports_incremental(self) -> bool:
+        # An edit can turn edges anywhere into back edges or back
+        return not self.cycle_aware
+
+    def _get_parent_row(self, node: int, rows: Dict[int, int], graph: FlowGraph) -> int:
+        """Get the minimum row of this block's parents, or 0 if no parents have rows yet."""
+        parents = graph.forward_predecessors(node) if self.cycle_aware else graph.predecessors(node)
+        parent_rows = [rows[p] for p in parents if p in rows]
+        return min(parent_rows) if parent_rows else 0
+
+    def _build_next_action_map(self, graph: FlowGraph) -> Dict[int, int]:
+        """Build a map of node -> parent that reaches it via NextAction.
+
+        When several blocks share a NextAction target, the last one wins.
+        Loop edges are skipped when cycle-aware.
+        """
+        next_action_parent = {}
+        offsets = graph.succ_offsets
+        back = graph.back_edges() if self.cycle_aware else None
+
+        # NextAction, when present, is always a node's first edge
+        for node in range(len(graph)):
+            edge = offsets[node]
+            if (edge < offsets[node + 1] and graph.succ_kinds[edge] == FlowGraph.NEXT
+                    and not (back and back[edge])):
+                next_action_parent[graph.succ_targets[edge]] = node
+
+        return next_action_parent
+
+    def assign_rows(self, graph: FlowGraph, levels: Dict[int, int],
+                    rows: Optional[Dict[int, int]] = None,
+                    from_level: int = 0) -> Dict[int, int]:
+        """Assign row (Y) positions to blocks within each level.
+
+        Key insight: Blocks reached via NextAction should stay at the same row
+        as their parent (horizontal flow). Only branching (conditions/errors)
+        creates new rows (vertical fan-out).
+
+        rows may be pre-filled with the rows of every block below from_level;
+        only levels from from_level on are then assigned.
+        """
+        next_action_parent = self._build_next_action_map(graph)
+
+        # Group blocks by level
+        level_groups = defaultdict(list)
+        for node, level in levels.items():
+            if level >= from_level:
+                level_groups[level].append(node)
+
+        rows = dict(rows) if rows else {}
+        # Track used rows at each level, mapping each used row to a candidate
+        # next free row so wide levels don't rescan their used rows
+        used_rows_per_level = defaultdict(dict)
+
+        # Process levels in order
+        for level in sorted(level_groups.keys()):
+            nodes_at_level = level_groups[level]
+
+            # Sort by parent's row to keep related branches together
+            nodes_at_level.sort(key=lambda n: self._get_parent_row(n, rows, graph))
+
+            for node in nodes_at_level:
+                # Check if this block is reached via NextAction
+                next_parent = next_action_parent.get(node)
+
+                if next_parent is not None and next_parent in rows:
+                    # Try to use same row as NextAction parent (horizontal flow)
+                    desired_row = rows[next_parent]
+                    if desired_row not in used_rows_per_level[level]:
+                        rows[node] = desired_row
+                        used_rows_per_level[level][desired_row] = desired_row + 1
+                        continue
+
+                # For branching targets or if desired row is taken, find next available
+                min_row = self._get_parent_row(node, rows, graph)
+
+                # Find first unused row at this level at or after min_row
+                row = self._find_free_row(used_rows_per_level[level], min_row)
+
+                rows[node] = row
+                used_rows_per_level[level][row] = row + 1
+
+        return rows
+
+    @staticmethod
+    def _find_free_row(next_free: Dict[int, int], row: int) -> int:
+        """Return the first row >= row not yet used at a level.
+
+        next_free maps each used row to a row at or below the next free one;
+        chains are compressed on every lookup.
+        """
+        path = []
+        while row in next_free:
+            path.append(row)
+            row = next_free[row]
+        for used in path:
+            next_free[used] = row
+        return row
+
+
+class SugiyamaLayout(LayoutEngine):
+    """Layered layout with crossing reduction.
+
+    Columns are reordered by alternating down/up sweeps that sort each
+    column by the mean (barycenter) or median relative position of its
+    neighbours in earlier (down) or later (up) columns. Edges spanning
+    several columns count with their far end's position instead of through
+    dummy nodes, keeping each sweep O(E log V). The ordering with the fewest
+    crossings is kept, then each block is placed at its parents' mean row
+    when free, else the next row down, preserving the order.
+    """
+
+    name = "sugiyama"
+
+    def __init__(self, sweeps: int = 8, method: str = "barycenter", cycle_aware: bool = True):
+        if method not in ("barycenter", "median"):
+            raise ValueError(f"Unknown crossing reduction method {method!r}, expected barycenter or median")
+        self.sweeps = sweeps
+        self.method = method
+        self.cycle_aware = cycle_aware
+
+    def assign_rows(self, graph: FlowGraph, levels: Dict[int, int],
+                    rows: Optional[Dict[int, int]] = None,
+                    from_level: int = 0) -> Dict[int, int]:
+        if not levels:
+            return {}
+
+        # Forward edges only: back edges and edges within a column would
+        # pull blocks towards their own descendants. Loops are left out
+        # even where they point forward when cycle-aware.
+        preds: Dict[int, List[int]] = defaultdict(list)
+        succs: Dict[int, List[int]] = defaultdict(list)
+        back = graph.back_edges() if self.cycle_aware else None
+        for node, level in levels.items():
+            for e in range(graph.succ_offsets[node], graph.succ_offsets[node + 1]):
+                target = graph.succ_targets[e]
+                if levels.get(target, -1) > level and not (back and back[e]):
+                    succs[node].append(target)
+                    preds[target].append(node)
+
+        # Initial order: discovery (BFS) order within each column
+        columns: List[List[int]] = [[] for _ in range(max(levels.values()) + 1)]
+        for node, level in levels.items():
+            columns[level].append(node)
+
+        position = self._positions(columns)
+        best = [list(column) for column in columns]
+        best_crossings = count_crossings(graph, levels, self._order_rows(columns))
+
+        for sweep in range(self.sweeps):
+            downward = sweep % 2 == 0
+            neighbours = preds if downward else succs
+            order = range(1, len(columns)) if downward else range(len(columns) - 2, -1, -1)
+            for level in order:
+                column = columns[level]
+                keys = {node: self._key(node, neighbours, position) for node in column}
+                column.sort(key=keys.__getitem__)
+                for i, node in enumerate(column):
+                    position[node] = (i + 0.5) / len(column)
+
+            crossings = count_crossings(graph, levels, self._order_rows(columns))
+            if crossings < best_crossings:
+                best_crossings = crossings
+                best = [list(column) for column in columns]
+
+        return self._align_rows(best, preds)
+
+    def _key(self, node: int, neighbours: Dict[int, List[int]], position: Dict[int, float]) -> float:
+        """Sort key of a node: barycenter/median of its neighbours, else its current position."""
+        values = [position[n] for n in neighbours.get(node, ())]
+        if not values:
+            return position[node]
+        if self.method == "median":
+            values.sort()
+            return values[len(values) // 2]
+        return sum(values) / len(values)
+
+    @staticmethod
+    def _positions(columns: List[List[int]]) -> Dict[int, float]:
+        """Relative position (0-1) of each node within its column."""
+        return {node: (i + 0.5) / len(column) for column in columns for i, node in enumerate(column)}
+
+    @staticmethod
+    def _order_rows(columns: List[List[int]]) -> Dict[int, int]:
+        """Rows straight from the column order (top-aligned)."""
+        return {node: i for column in columns for i, node in enumerate(column)}
+
+    @staticmethod
+    def _align_rows(columns: List[List[int]], preds: Dict[int, List[int]]) -> Dict[int, int]:
+        """Place each node at its parents' mean row if free, keeping column order."""
+        rows: Dict[int, int] = {}
+        for column in columns:
+            next_row = 0
+            for node in column:
+                parent_rows = [rows[p] for p in preds.get(node, ()) if p in rows]
+                desired = round(sum(parent_rows) / len(parent_rows)) if parent_rows else next_row
+                rows[node] = max(desired, next_row)
+                next_row = rows[node] + 1
+        return rows
+
+
+LAYOUT_ENGINES = {
+    LayeredBFSLayout.name: LayeredBFSLayout,
+    SugiyamaLayout.name: SugiyamaLayout,
+}
+
+
+def count_crossings(graph: FlowGraph, levels: Dict[int, int], rows: Dict[int, int]) -> int:
+    """Count crossings of forward edges drawn as straight lines between columns.
+
+    An edge spanning several columns is split into one segment per column
+    gap at interpolated rows. Back edges and edges within a column are not
+    counted. Runs in O(S log S) for S segments.
+    """
+    gaps: Dict[int, List[Tuple[float, float]]] = defaultdict(list)
+    for node, level in levels.items():
+        y0 = rows[node]
+        for target in graph.successors(node):
+            target_level = levels.get(target)
+            if target_level is None or target_level <= level:
+                continue
+            y1 = rows[target]
+            span = target_level - level
+            for step in range(span):
+                gaps[level + step].append((y0 + (y1 - y0) * step / span,
+                                           y0 + (y1 - y0) * (step + 1) / span))
+
+    return sum(_count_inversions([right for _, right in sorted(segments)])
+               for segments in gaps.values())
+
+
+def _count_inversions(values: List[float]) -> int:
+    """Number of pairs i < j with values[i] > values[j], in O(n log n)."""
+    return _merge_sort_inversions(values)[1]
+
+
+def _merge_sort_inversions(values: List[float]) -> Tuple[List[float], int]:
+    """(sorted values, inversions), merging the sorted halves at each level."""
+    if len(values) < 2:
+        return values, 0
+    middle = len(values) // 2
+    left, left_inversions = _merge_sort_inversions(values[:middle])
+    right, right_inversions = _merge_sort_inversions(values[middle:])
+    inversions = left_inversions + right_inversions
+
+    merged = []
+    i = j = 0
+    while i < len(left) and j < len(right):
+        if right[j] < left[i]:
+            merged.append(right[j])
+            j += 1
+            inversions += len(left) - i  # right[j] is below every remaining left value
+        else:
+            merged.append(left[i])
+            i += 1
+    merged.extend(left[i:])
+    merged.extend(right[j:])
+    return merged, inversions
@@ -1,54 +1,150 @@
+import argparse
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 from decompiler import FlowDecompiler
 
 
-def process_flow(input_path: str, output_path: str):
-    """Decompile and recompile a contact flow."""
-    print(f"Processing: {input_path}")
-    
+@dataclass
+class FlowResult:
+    """Outcome of decompiling and recompiling one flow file."""
+    input_path: str
+    output_path: str
+    status: str = "ok"          # "ok", "skipped" (unknown blocks) or "error"
+    block_count: int = 0
+    unknown_types: Dict[str, int] = field(default_factory=dict)  # type -> count
+    error: Optional[str] = None
+    seconds: float = 0.0
+
+
+def process_flow(input_path: str, output_path: str, verbose: bool = False) -> FlowResult:
+    """Decompile and recompile a contact flow.
+
+    With verbose, prints each decompiled block and any unknown block data.
+    """
+    start = time.perf_counter()
+    result = FlowResult(input_path=input_path, output_path=output_path)
+    if verbose:
+        print(f"Processing: {input_path}")
+
     # Decompile
-    flow, has_unknown_blocks = FlowDecompiler.decompile_from_file(input_path)
-    print(f"  Decompiled {len(flow.actions)} blocks:")
-    for action in flow.actions:
-        print(f"    - {action.type} (ID: {action.identifier[:8]}...)")
-    
+    flow, diagnostics = FlowDecompiler.decompile_file_with_diagnostics(input_path, verbose)
+    result.block_count = diagnostics.action_count
+    result.unknown_types = diagnostics.unknown_type_counts
+    if verbose:
+        print(f"  Decompiled {len(flow.actions)} blocks:")
+        for action in flow.actions:
+            print(f"    - {action.type} (ID: {action.identifier[:8]}...)")
+
     # Skip output if unknown blocks found
-    if has_unknown_blocks:
-        print(f"  [SKIP] Skipping output due to unknown blocks\n")
-        return False
-    
+    if diagnostics.has_unknown_blocks:
+        if verbose:
+            print(f"  [SKIP] Skipping output due to unknown blocks\n")
+        result.status = "skipped"
+        result.seconds = time.perf_counter() - start
+        return result
+
     # Recompile
     recompiled_json = flow.to_json()
-    
+
     # Write to output
     with open(output_path, 'w') as f:
         f.write(recompiled_json)
-    print(f"  [OK] Written to: {output_path}\n")
-    return True
+    if verbose:
+        print(f"  [OK] Written to: {output_path}\n")
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def _process_job(job: Tuple[str, str]) -> FlowResult:
+    """Batch worker: process one (input, output) pair, capturing failures."""
+    input_path, output_path = job
+    try:
+        return process_flow(input_path, output_path)
+    except Exception as e:
+        return FlowResult(input_path=input_path, output_path=output_path,
+                          status="error", error=f"{type(e).__name__}: {e}")
+
+
+def process_flows(jobs: List[Tuple[str, str]], workers: Optional[int] = None,
+                  chunksize: int = 1) -> List[FlowResult]:
+    """Process (input, output) pairs in a process pool.
+
+    Results are returned in the same order as jobs. workers defaults to the
+    CPU count; workers=1 runs in-process without a pool.
+    """
+    if workers == 1:
+        return [_process_job(job) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_process_job, jobs, chunksize=chunksize))
+
+
+def int_at_least(minimum: int):
+    """argparse type for integers no smaller than minimum."""
+    def parse(value: str) -> int:
+        try:
+            number = int(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid int value: {value!r}") from None
+        if number < minimum:
+            raise argparse.ArgumentTypeError(f"must be at least {minimum}, got {number}")
+        return number
+    return parse
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Decompile and recompile all flows in input/")
+    parser.add_argument("--workers", type=int_at_least(0), default=None,
+                        help="Process flows in parallel with this many processes "
+                             "(0 = one per CPU). Default: serial")
+    parser.add_argument("--chunksize", type=int_at_least(1), default=1,
+                        help="Flows handed to a worker at a time in parallel mode")
+    parser.add_argument("--verbose", action="store_true",
+                        help="Print every decompiled block and unknown block data (serial mode)")
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
+    args = parse_args()
+
     # Setup paths
     project_root = Path(__file__).parent.parent
     input_dir = project_root / "input"
     output_dir = project_root / "output"
-    
-    success_count = 0
-    skipped_count = 0
-    
-    for input_file in input_dir.glob("*.json"):
-        # Create output filename with Cx_ prefix
-        output_filename = f"Cx_{input_file.name}"
-        output_path = output_dir / output_filename
-        
-        if process_flow(str(input_file), str(output_path)):
-            success_count += 1
-        else:
-            skipped_count += 1
-    
+
+    # Create output filenames with Cx_ prefix
+    jobs = [(str(input_file), str(output_dir / f"Cx_{input_file.name}"))
+            for input_file in sorted(input_dir.glob("*.json"))]
+
+    start = time.perf_counter()
+    if args.workers is None:
+        results = [process_flow(input_path, output_path, verbose=args.verbose)
+                   for input_path, output_path in jobs]
+    else:
+        results = process_flows(jobs, workers=args.workers or os.cpu_count(), chunksize=args.chunksize)
+    elapsed = time.perf_counter() - start
+
+    for result in results:
+        if result.status == "error":
+            print(f"[ERROR] {result.input_path}: {result.error}")
+        elif result.status == "skipped" and not args.verbose:
+            unknown = ", ".join(f"{t} x{n}" for t, n in result.unknown_types.items())
+            print(f"[SKIP] {result.input_path}: unknown block types: {unknown}")
+
+    success_count = sum(1 for r in results if r.status == "ok")
+    skipped_count = sum(1 for r in results if r.status == "skipped")
+    error_count = sum(1 for r in results if r.status == "error")
+
     print("=" * 60)
-    print(f"Processed: {success_count + skipped_count} flows")
+    print(f"Processed: {len(results)} flows")
     print(f"Success: {success_count}")
     print(f"Skipped: {skipped_count}")
+    if error_count:
+        print(f"Errors: {error_count}")
+    if elapsed > 0:
+        print(f"Throughput: {len(results) / elapsed:.1f} flows/sec ({elapsed:.2f}s)")
     print("=" * 60)
@@ -0,0 +1,203 @@
+"""
+Monte-Carlo Contact Analysis - Vectorized flow simulation with NumPy.
+
+Treats a flow as a Markov chain: every block gets a probability
+distribution over its transitions (from input distributions, percentage
+splits and error rates), and N contacts advance through it together as an
+array of block indices, one vectorized step at a time.
+
+Requires NumPy (pip install numpy).
+
+Example:
+    analyzer = MonteCarloAnalyzer(flow)
+    result = analyzer.run(ContactModel(error_probabilities={"InvokeLambdaFunction": 0.05}),
+                          contacts=100_000, seed=1)
+    result.terminal_probabilities
+"""
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+from blocks.base import FlowBlock
+from flow_graph import FlowGraph
+from simulator import block_branches, condition_matches
+
+try:
+    import numpy as np
+except ImportError:  # Optional dependency
+    np = None
+
+
+@dataclass
+class ContactModel:
+    """Probabilistic caller and system behaviour for a Monte-Carlo run.
+
+    Distributions map a value to its probability. Blocks without an entry
+    pick uniformly among the values their conditions test for.
+    """
+    # GetParticipantInput identifier -> {entered value or None (timeout): p}
+    input_distributions: Dict[str, Dict[Optional[str], float]] = field(default_factory=dict)
+    # ConnectParticipantWithLexBot identifier -> {intent or None (no match): p}
+    intent_distributions: Dict[str, Dict[Optional[str], float]] = field(default_factory=dict)
+    # Compare identifier -> {compared value: p}
+    compare_distributions: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    # Probability CheckHoursOfOperation is open, by identifier or for all blocks
+    hours_open_probability: Dict[str, float] = field(default_factory=dict)
+    default_hours_open_probability: float = 1.0
+    # Probability a block takes its error branch, keyed by identifier or block type
+    error_probabilities: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class MonteCarloResult:
+    """Visit counts and ending probabilities from a Monte-Carlo run."""
+    contacts: int
+    visits: Dict[str, int]                   # Block identifier -> total visits
+    terminal_probabilities: Dict[str, float]  # Block contacts ended on -> share of contacts
+    terminal_types: Dict[str, str]           # Terminal block identifier -> block type
+    step_limited: float = 0.0                # Share of contacts still running at max_steps
+
+    def probabilities_by_type(self) -> Dict[str, float]:
+        """Ending probabilities summed per terminal block type."""
+        totals: Dict[str, float] = {}
+        for block_id, p in self.terminal_probabilities.items():
+            block_type = self.terminal_types[block_id]
+            totals[block_type] = totals.get(block_type, 0.0) + p
+        return totals
+
+
+class MonteCarloAnalyzer:
+    """Push batches of synthetic contacts through a flow as NumPy arrays."""
+
+    MAX_STEPS = 500
+
+    def __init__(self, flow):
+        if np is None:
+            raise ImportError("MonteCarloAnalyzer requires NumPy: pip install numpy")
+        self.graph = FlowGraph.from_flow(flow)
+        self.sink = len(self.graph)  # Absorbing node every ending transition leads to
+
+    def _target(self, block_id: Optional[str]) -> int:
+        """Node index for a transition target; missing targets end the contact."""
+        return self.graph.index.get(block_id, self.sink) if block_id else self.sink
+
+    def _branches(self, block: FlowBlock, model: ContactModel) -> List[Tuple[int, float]]:
+        """(target node, probability) pairs for one block under a model."""
+        parsed = block_branches(block, self._target)
+        next_node = parsed.next_node
+        conditions = parsed.conditions
+        no_match_node = parsed.no_match_node
+
+        def resolve(value) -> int:
+            for operator, operand, target in conditions:
+                if condition_matches(operator, operand, value):
+                    return target
+            return no_match_node
+
+        def from_values(distribution: Optional[Dict], timeout_node: int) -> List[Tuple[int, float]]:
+            if distribution is None:
+                operands = [operand for _, operand, _ in conditions]
+                distribution = {operand: 1.0 / len(operands) for operand in operands}
+            return [(timeout_node if value is None else resolve(value), p)
+                    for value, p in distribution.items()]
+
+        branches = [(next_node, 1.0)]
+        if conditions:
+            if block.type == "GetParticipantInput":
+                branches = from_values(model.input_distributions.get(block.identifier), parsed.timeout_node)
+            elif block.type == "ConnectParticipantWithLexBot":
+                branches = from_values(model.intent_distributions.get(block.identifier), no_match_node)
+            elif block.type == "Compare":
+                branches = from_values(model.compare_distributions.get(block.identifier), no_match_node)
+            elif block.type == "CheckHoursOfOperation":
+                p_open = model.hours_open_probability.get(block.identifier,
+                                                          model.default_hours_open_probability)
+                branches = [(resolve("True"), p_open), (resolve("False"), 1.0 - p_open)]
+            elif block.type == "DistributeByPercentage":
+                branches = self._percentage_branches(conditions, no_match_node)
+
+        p_error = model.error_probabilities.get(block.identifier,
+                                                model.error_probabilities.get(block.type, 0.0))
+        if p_error:
+            error_node = parsed.error_node(self.sink)
+            branches = [(target, p * (1.0 - p_error)) for target, p in branches]
+            branches.append((error_node, p_error))
+
+        return branches
+
+    @staticmethod
+    def _percentage_branches(conditions, default_node: int) -> List[Tuple[int, float]]:
+        """Split a 0-100 roll across NumberLessThan conditions, first match wins."""
+        branches = []
+        covered = 0.0
+        for operator, operand, target in conditions:
+            if operator != "NumberLessThan":
+                continue
+            try:
+                upper = min(float(operand), 100.0)
+            except ValueError:
+                continue
+            if upper > covered:
+                branches.append((target, (upper - covered) / 100.0))
+                covered = upper
+        branches.append((default_node, (100.0 - covered) / 100.0))
+        return branches
+
+    def _tables(self, model: ContactModel):
+        """Padded (targets, cumulative probability) arrays, one row per node."""
+        rows = [self._branches(block, model) for block in self.graph.blocks]
+        rows.append([(self.sink, 1.0)])
+        width = max(len(row) for row in rows)
+
+        targets = np.full((len(rows), width), self.sink, dtype=np.int64)
+        cumulative = np.ones((len(rows), width))
+        for node, row in enumerate(rows):
+            total = sum(p for _, p in row) or 1.0
+            running = 0.0
+            for k, (target, p) in enumerate(row):
+                running += p / total
+                targets[node, k] = target
+                cumulative[node, k] = running
+            cumulative[node, len(row) - 1:] = 1.0
+            targets[node, len(row):] = row[-1][0]
+        return targets, cumulative
+
+    def run(self, model: Optional[ContactModel] = None, contacts: int = 10_000,
+            seed: Optional[int] = None, max_steps: int = MAX_STEPS) -> MonteCarloResult:
+        """Advance contacts together until every one has ended (or max_steps)."""
+        model = model or ContactModel()
+        rng = np.random.default_rng(seed)
+        size = self.sink + 1
+        visits = np.zeros(size, dtype=np.int64)
+        endings = np.zeros(size, dtype=np.int64)
+
+        active = np.empty(0, dtype=np.int64)
+        if self.graph.start is not None:
+            targets, cumulative = self._tables(model)
+            active = np.full(contacts, self.graph.start, dtype=np.int64)
+            for _ in range(max_steps):
+                if not active.size:
+                    break
+                visits += np.bincount(active, minlength=size)
+                roll = rng.random(active.size)
+                choice = (roll[:, None] >= cumulative[active]).sum(axis=1)
+                following = targets[active, choice]
+                done = following == self.sink
+                endings += np.bincount(active[done], minlength=size)
+                active = following[~done]
+
+        ids = self.graph.ids
+        blocks = self.graph.blocks
+        return MonteCarloResult(
+            contacts=contacts,
+            visits={ids[node]: int(count) for node, count in enumerate(visits[:-1]) if count},
+            terminal_probabilities={ids[node]: int(count) / contacts
+                                    for node, count in enumerate(endings[:-1]) if count},
+            terminal_types={ids[node]: blocks[node].type
+                            for node, count in enumerate(endings[:-1]) if count},
+            step_limited=active.size / contacts if contacts else 0.0,
+        )
+
+    def sweep(self, models: Iterable[ContactModel], contacts: int = 10_000,
+              seed: Optional[int] = None) -> List[MonteCarloResult]:
+        """Run the same contact count under each model, e.g. for capacity planning."""
+        rng = np.random.default_rng(seed)
+        return [self.run(model, contacts, seed=int(rng.integers(2**32))) for model in models]
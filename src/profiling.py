@@ -0,0 +1,120 @@
+"""
+Compile Profiling - Per-phase timings of ContactFlowBuilder.compile().
+
+Each phase of a compile (graph build, level and row assignment, row
+compaction, positioning, metadata and to_dict serialization) is timed with
+its node/edge counts and, optionally, its peak traced memory. The stats can
+be printed or saved as a Chrome trace (open in chrome://tracing or
+https://ui.perfetto.dev).
+
+Example:
+    stats = flow.profile_compile(memory=True)
+    print(stats.summary())
+    stats.write_chrome_trace("compile_trace.json")
+"""
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+
+@dataclass
+class PhaseStats:
+    """Timing of one compile phase."""
+    name: str
+    start: float                        # Seconds since the compile started
+    seconds: float = 0.0
+    peak_memory: Optional[int] = None   # Bytes allocated at the phase's peak, when traced
+    counts: Dict[str, int] = field(default_factory=dict)  # e.g. blocks, edges, levels
+
+
+@dataclass
+class CompileStats:
+    """Phases of one profiled compile, in the order they ran."""
+    flow_name: str
+    blocks: int = 0
+    edges: int = 0
+    seconds: float = 0.0
+    phases: List[PhaseStats] = field(default_factory=list)
+
+    def phase(self, name: str) -> Optional[PhaseStats]:
+        """First phase with the given name, if it ran."""
+        return next((phase for phase in self.phases if phase.name == name), None)
+
+    def summary(self) -> str:
+        """One line per phase with its share of the compile time."""
+        lines = [f"Compile of {self.flow_name!r}: {self.blocks} blocks, {self.edges} transitions, "
+                 f"{self.seconds * 1000:.1f} ms"]
+        for phase in self.phases:
+            share = phase.seconds / self.seconds * 100 if self.seconds else 0.0
+            memory = f" peak {phase.peak_memory / 1024:.0f} KiB" if phase.peak_memory is not None else ""
+            counts = "".join(f" {key}={value}" for key, value in phase.counts.items())
+            lines.append(f"  {phase.name:<16} {phase.seconds * 1000:>9.2f} ms {share:>5.1f}%{memory}{counts}")
+        return "\n".join(lines)
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Phases as complete ("X") events in Chrome trace event format."""
+        events = [{
+            "name": "compile", "cat": "compile", "ph": "X", "ts": 0.0, "dur": self.seconds * 1e6,
+            "pid": 1, "tid": 1, "args": {"flow": self.flow_name, "blocks": self.blocks, "edges": self.edges},
+        }]
+        for phase in self.phases:
+            args: Dict[str, Any] = dict(phase.counts)
+            if phase.peak_memory is not None:
+                args["peak_memory"] = phase.peak_memory
+            events.append({
+                "name": phase.name, "cat": "compile", "ph": "X", "ts": phase.start * 1e6,
+                "dur": phase.seconds * 1e6, "pid": 1, "tid": 1, "args": args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: str):
+        """Save to_chrome_trace() as JSON."""
+        with open(path, 'w') as f:
+            json.dump(self.to_chrome_trace(), f, indent=2)
+
+
+class CompileProfiler:
+    """Collects PhaseStats while a compile runs.
+
+    With memory=True, tracemalloc is started (if it isn't already) and each
+    phase records its peak allocation above the memory in use when it began.
+    Tracing slows the compile down, so timings are best taken without it.
+    """
+
+    def __init__(self, flow_name: str, memory: bool = False):
+        self.stats = CompileStats(flow_name)
+        self.memory = memory
+        self._started_tracing = False
+        self._origin = 0.0
+
+    def __enter__(self) -> 'CompileProfiler':
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._origin = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stats.seconds = time.perf_counter() - self._origin
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[Dict[str, int]]:
+        """Time the enclosed code; yields the phase's counts dict to fill in."""
+        if self.memory:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        record = PhaseStats(name, start - self._origin)
+        try:
+            yield record.counts
+        finally:
+            record.seconds = time.perf_counter() - start
+            if self.memory:
+                record.peak_memory = tracemalloc.get_traced_memory()[1] - baseline
+            self.stats.phases.append(record)
@@ -0,0 +1,289 @@
+"""
+Flow Simulator - Run synthetic contacts through a flow offline.
+
+Each block is compiled once into a small step function, so a contact is a
+loop of integer lookups. Caller behaviour and external systems (DTMF input,
+Lex intents, hours of operation, contact attributes, errors) come from
+injectable stubs.
+
+Example:
+    sim = FlowSimulator(flow, SimulationStubs(error_rates={"InvokeLambdaFunction": 0.02}))
+    result = sim.run(1_000_000, seed=1)
+    result.top_paths(5)
+    result.rates(contacts_per_second=3.0)
+"""
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from blocks.base import FlowBlock
+from flow_graph import FlowGraph
+
+
+END = -1        # Block has no transition to follow
+DANGLING = -2   # Transition points at an identifier with no block
+STEP_LIMIT = -3  # Contact exceeded max_steps (e.g. an unbounded retry loop)
+
+OUTCOME_NAMES = {DANGLING: "<dangling>", STEP_LIMIT: "<step limit>"}
+
+
+def condition_matches(operator: str, operand: str, value) -> bool:
+    """Evaluate a Connect condition operator against a runtime value."""
+    if operator == "Equals":
+        return str(value) == operand
+    if operator.startswith("Number"):
+        try:
+            left, right = float(value), float(operand)
+        except (TypeError, ValueError):
+            return False
+        if operator == "NumberGreaterThan":
+            return left > right
+        if operator == "NumberLessThan":
+            return left < right
+        if operator == "NumberGreaterOrEqualTo":
+            return left >= right
+        if operator == "NumberLessOrEqualTo":
+            return left <= right
+        return False
+    if operator == "TextStartsWith":
+        return str(value).startswith(operand)
+    if operator == "TextEndsWith":
+        return str(value).endswith(operand)
+    if operator == "TextContains":
+        return operand in str(value)
+    return False
+
+
+class BlockBranches(NamedTuple):
+    """A block's transitions as node indices, shared by the simulation engines."""
+    next_node: int
+    conditions: List[Tuple[str, str, int]]  # (operator, first operand, target node)
+    errors: Dict[str, int]                  # ErrorType -> target node
+
+    @property
+    def no_match_node(self) -> int:
+        """Where a value matching none of the conditions goes."""
+        return self.errors.get("NoMatchingCondition", self.next_node)
+
+    @property
+    def timeout_node(self) -> int:
+        """Where an input timeout goes."""
+        return self.errors.get("InputTimeLimitExceeded", self.no_match_node)
+
+    def error_node(self, default: int) -> int:
+        """Where a failed block goes: NoMatchingError, else the first error listed."""
+        return self.errors.get("NoMatchingError", next(iter(self.errors.values()), default))
+
+
+def block_branches(block: FlowBlock, target: Callable[[Optional[str]], int]) -> BlockBranches:
+    """Parse a block's NextAction, Conditions and Errors, mapping identifiers through target."""
+    transitions = block.transitions
+    conditions = [
+        (c.get("Condition", {}).get("Operator", "Equals"),
+         (c.get("Condition", {}).get("Operands") or [""])[0],
+         target(c.get("NextAction")))
+        for c in transitions.get("Conditions", [])
+    ]
+    errors = {e.get("ErrorType"): target(e.get("NextAction")) for e in transitions.get("Errors", [])}
+    return BlockBranches(target(transitions.get("NextAction")), conditions, errors)
+
+
+@dataclass
+class SimulationStubs:
+    """Injected behaviour for the parts of a flow that depend on the outside world.
+
+    Block-level stubs receive the block and the simulation's Random instance.
+    """
+    # DTMF/text entered at a GetParticipantInput; None means the caller timed
+    # out. Default: a uniformly random choice among the block's condition values.
+    participant_input: Optional[Callable[[FlowBlock, random.Random], Optional[str]]] = None
+    # Intent returned by a ConnectParticipantWithLexBot; None means no intent
+    # matched. Default: a uniformly random choice among the block's intents.
+    lex_intent: Optional[Callable[[FlowBlock, random.Random], Optional[str]]] = None
+    # Whether CheckHoursOfOperation is inside hours. Default: always open.
+    in_hours: Optional[Callable[[FlowBlock, random.Random], bool]] = None
+    # Initial attributes for each contact, keyed by reference path without
+    # the "$." prefix (e.g. "Attributes.tier", "External.count").
+    contact_attributes: Optional[Callable[[random.Random], Dict[str, str]]] = None
+    # Probability a block takes its error branch, keyed by identifier or block
+    # type. The branch taken is NoMatchingError, or else the first error listed.
+    error_rates: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class SimulationResult:
+    """Aggregated outcome of a simulation run."""
+    contacts: int
+    paths: Dict[Tuple[str, ...], int]   # Block identifiers visited -> contacts
+    endings: Dict[str, int]             # Last block (or outcome marker) -> contacts
+    visits: Dict[str, int]              # Block identifier -> total visits
+    block_types: Dict[str, str]         # Block identifier -> block type
+    seconds: float = 0.0
+
+    def top_paths(self, n: int = 10) -> List[Tuple[Tuple[str, ...], int]]:
+        """The n most frequent paths through the flow."""
+        return Counter(self.paths).most_common(n)
+
+    def visits_by_type(self, block_type: str) -> Dict[str, int]:
+        """Visit counts of every block of a given type."""
+        return {block_id: count for block_id, count in self.visits.items()
+                if self.block_types.get(block_id) == block_type}
+
+    def rates(self, contacts_per_second: float) -> Dict[str, Dict[str, float]]:
+        """Expected Lambda invocation and queue arrival rates per block.
+
+        Scales visit frequencies to an arrival rate of contacts_per_second.
+        """
+        scale = contacts_per_second / self.contacts if self.contacts else 0.0
+        return {
+            "lambda_invocations": {block_id: count * scale for block_id, count
+                                   in self.visits_by_type("InvokeLambdaFunction").items()},
+            "queue_arrivals": {block_id: count * scale for block_id, count
+                               in self.visits_by_type("TransferContactToQueue").items()},
+        }
+
+    @property
+    def contacts_per_second(self) -> float:
+        return self.contacts / self.seconds if self.seconds else 0.0
+
+
+class FlowSimulator:
+    """Execute a ContactFlow or ContactFlowBuilder against synthetic contacts."""
+
+    MAX_STEPS = 500
+
+    def __init__(self, flow, stubs: Optional[SimulationStubs] = None, max_steps: int = MAX_STEPS):
+        self.graph = FlowGraph.from_flow(flow)
+        self.stubs = stubs or SimulationStubs()
+        self.max_steps = max_steps
+        self.uses_attributes = False
+        self._steps = [self._compile_block(block) for block in self.graph.blocks]
+
+    def _target(self, block_id: Optional[str]) -> int:
+        """Node index for a transition target."""
+        if not block_id:
+            return END
+        node = self.graph.index.get(block_id)
+        return DANGLING if node is None else node
+
+    def _compile_block(self, block: FlowBlock) -> Callable[[random.Random, dict], int]:
+        """Build the step function: (rng, contact attributes) -> next node."""
+        stubs = self.stubs
+        branches = block_branches(block, self._target)
+        next_node = branches.next_node
+        conditions = branches.conditions
+
+        error_rate = stubs.error_rates.get(block.identifier, stubs.error_rates.get(block.type, 0.0))
+        error_node = branches.error_node(END)
+        no_match_node = branches.no_match_node
+        timeout_node = branches.timeout_node
+        operands = [operand for _, operand, _ in conditions]
+
+        # Value the block's conditions are evaluated against
+        value = None
+        if block.type == "GetParticipantInput" and (conditions or stubs.participant_input):
+            if stubs.participant_input:
+                value = lambda rng, attrs: stubs.participant_input(block, rng)
+            else:
+                value = lambda rng, attrs: rng.choice(operands)
+        elif block.type == "ConnectParticipantWithLexBot" and conditions:
+            if stubs.lex_intent:
+                value = lambda rng, attrs: stubs.lex_intent(block, rng)
+            else:
+                value = lambda rng, attrs: rng.choice(operands)
+            timeout_node = no_match_node  # No intent is a no-match, not a timeout
+        elif block.type == "CheckHoursOfOperation" and conditions:
+            if stubs.in_hours:
+                value = lambda rng, attrs: str(bool(stubs.in_hours(block, rng)))
+            else:
+                value = lambda rng, attrs: "True"
+        elif block.type == "DistributeByPercentage" and conditions:
+            value = lambda rng, attrs: rng.random() * 100
+        elif block.type == "Compare" and conditions:
+            self.uses_attributes = True
+            reference = block.parameters.get("ComparisonValue", "")
+            if reference.startswith("$."):
+                path = reference[2:]
+                value = lambda rng, attrs: attrs.get(path)
+            else:
+                value = lambda rng, attrs: reference
+
+        # Side effect on the contact
+        updates = None
+        if block.type == "UpdateContactAttributes":
+            self.uses_attributes = True
+            updates = {f"Attributes.{k}": v for k, v in (block.parameters.get("Attributes") or {}).items()}
+
+        def step(rng: random.Random, attrs: dict) -> int:
+            if error_rate and rng.random() < error_rate:
+                return error_node
+            if updates:
+                attrs.update(updates)
+            if value is None:
+                return next_node
+            result = value(rng, attrs)
+            if result is None:
+                return timeout_node
+            for operator, operand, target in conditions:
+                if condition_matches(operator, operand, result):
+                    return target
+            return no_match_node
+
+        return step
+
+    def run(self, contacts: int, seed: Optional[int] = None) -> SimulationResult:
+        """Push contacts through the flow and aggregate the paths they took."""
+        rng = random.Random(seed)
+        steps = self._steps
+        max_steps = self.max_steps
+        start_node = self.graph.start
+        initial_attributes = self.stubs.contact_attributes
+        uses_attributes = self.uses_attributes or initial_attributes is not None
+        path_counts: Counter = Counter()
+
+        started = time.perf_counter()
+        if start_node is None:
+            path_counts[((), END)] = contacts
+        else:
+            attrs = {}
+            for _ in range(contacts):
+                if uses_attributes:
+                    attrs = dict(initial_attributes(rng)) if initial_attributes else {}
+                node = start_node
+                path = []
+                while node >= 0:
+                    path.append(node)
+                    node = steps[node](rng, attrs)
+                    if node >= 0 and len(path) >= max_steps:
+                        node = STEP_LIMIT  # Ran max_steps blocks and would run another
+                        break
+                path_counts[(tuple(path), node)] += 1
+        seconds = time.perf_counter() - started
+
+        return self._summarize(contacts, path_counts, seconds)
+
+    def _summarize(self, contacts: int, path_counts: Counter, seconds: float) -> SimulationResult:
+        """Convert node-index path counts into identifier-keyed results."""
+        ids = self.graph.ids
+        paths: Counter = Counter()
+        endings: Counter = Counter()
+        visits: Counter = Counter()
+
+        for (path, outcome), count in path_counts.items():
+            paths[tuple(ids[node] for node in path)] += count
+            if outcome in OUTCOME_NAMES:
+                endings[OUTCOME_NAMES[outcome]] += count
+            elif path:
+                endings[ids[path[-1]]] += count
+            for node in path:
+                visits[ids[node]] += count
+
+        return SimulationResult(
+            contacts=contacts,
+            paths=dict(paths),
+            endings=dict(endings),
+            visits=dict(visits),
+            block_types={block.identifier: block.type for block in self.graph.blocks},
+            seconds=seconds,
+        )
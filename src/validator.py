@@ -0,0 +1,201 @@
+"""
+Flow Validator - Offline checks for AWS Connect flow JSON.
+
+Checks the rules documented on the block classes (required error branches,
+mutually exclusive parameters, dependent parameters) plus flow-wide
+structure (start action, duplicate identifiers, dangling transitions)
+without calling the Connect API.
+
+Usage: python validator.py <flow_file.json> [...]
+"""
+import json_backend
+import sys
+from dataclasses import dataclass
+from typing import Callable, Container, List, Optional, Dict, Any, Tuple
+from decompiler import FlowDecompiler
+
+
+PROMPT_PARAMETERS = ("Text", "PromptId", "SSML", "Media")
+
+
+@dataclass
+class ValidationIssue:
+    """A single rule violation found in a flow."""
+    severity: str               # "error" or "warning"
+    message: str
+    identifier: Optional[str] = None  # Action the issue belongs to, if any
+
+    def __str__(self) -> str:
+        where = f" [{self.identifier}]" if self.identifier else ""
+        return f"{self.severity.upper()}{where}: {self.message}"
+
+
+class FlowValidator:
+    """Validate AWS Connect flow JSON against the documented block rules."""
+
+    @classmethod
+    def required_errors(cls, action: dict) -> List[str]:
+        """Error types an action must handle, per its block documentation."""
+        block_type = action.get("Type")
+        params = action.get("Parameters", {})
+
+        if block_type == "GetParticipantInput":
+            required = ["NoMatchingError"]
+            if params.get("StoreInput", "False") == "False":
+                required.append("NoMatchingCondition")
+            return required
+
+        return []
+
+    @classmethod
+    def validate(cls, flow) -> List[ValidationIssue]:
+        """Validate a flow given as JSON dict, ContactFlow or ContactFlowBuilder."""
+        if hasattr(flow, "compile"):
+            flow = flow.compile()
+        elif hasattr(flow, "to_dict"):
+            flow = flow.to_dict()
+
+        issues: List[ValidationIssue] = []
+        actions = flow.get("Actions", [])
+
+        if not flow.get("Version"):
+            issues.append(ValidationIssue("error", "Missing Version"))
+
+        identifiers = set()
+        for action in actions:
+            identifier = action.get("Identifier")
+            if not identifier:
+                issues.append(ValidationIssue("error", "Action has no Identifier"))
+            elif identifier in identifiers:
+                issues.append(ValidationIssue("error", "Duplicate identifier", identifier))
+            identifiers.add(identifier)
+
+        issues.extend(cls.start_action_issues(flow.get("StartAction"), identifiers, bool(actions)))
+
+        for action in actions:
+            cls._validate_action(action, identifiers, issues)
+
+        return issues
+
+    @classmethod
+    def start_action_issues(cls, start_action: Optional[str], identifiers: Container[str],
+                            has_actions: bool) -> List[ValidationIssue]:
+        """StartAction must name an action of the flow."""
+        if has_actions and not start_action:
+            return [ValidationIssue("error", "Missing StartAction")]
+        if start_action and start_action not in identifiers:
+            return [ValidationIssue("error", f"StartAction {start_action} does not exist")]
+        return []
+
+    @classmethod
+    def transition_issues(cls, action: dict, identifiers: Container[str]) -> List[ValidationIssue]:
+        """Transitions to missing actions and required error branches the action lacks."""
+        identifier = action.get("Identifier")
+        transitions = action.get("Transitions", {})
+        errors = transitions.get("Errors", [])
+
+        # Transitions must point at actions in this flow
+        targets = [("NextAction", transitions.get("NextAction"))]
+        targets += [("Condition", c.get("NextAction")) for c in transitions.get("Conditions", [])]
+        targets += [(f"Error {e.get('ErrorType')}", e.get("NextAction")) for e in errors]
+        issues = [ValidationIssue("error", f"{label} points to missing action {target}", identifier)
+                  for label, target in targets if target and target not in identifiers]
+
+        handled_errors = {e.get("ErrorType") for e in errors}
+        for error_type in cls.required_errors(action):
+            if error_type not in handled_errors:
+                issues.append(ValidationIssue(
+                    "error", f"{action.get('Type')} requires a {error_type} error branch", identifier))
+        return issues
+
+    @classmethod
+    def _validate_action(cls, action: dict, identifiers: set, issues: List[ValidationIssue]):
+        """Check one action's type, parameters and transitions."""
+        identifier = action.get("Identifier")
+        block_type = action.get("Type")
+        params = action.get("Parameters", {})
+        conditions = action.get("Transitions", {}).get("Conditions", [])
+
+        def error(message: str):
+            issues.append(ValidationIssue("error", message, identifier))
+
+        if block_type not in FlowDecompiler.BLOCK_TYPE_MAP:
+            issues.append(ValidationIssue("warning", f"Unknown block type: {block_type}", identifier))
+
+        issues.extend(cls.transition_issues(action, identifiers))
+
+        if block_type in ("MessageParticipant", "GetParticipantInput", "ConnectParticipantWithLexBot"):
+            prompts = [p for p in PROMPT_PARAMETERS if p in params]
+            if len(prompts) > 1:
+                error(f"Prompt parameters are mutually exclusive: {', '.join(prompts)}")
+
+        if block_type == "GetParticipantInput":
+            cls._validate_get_participant_input(params, conditions, error)
+        elif block_type == "ConnectParticipantWithLexBot":
+            if ("LexV2Bot" in params) == ("LexBot" in params):
+                error("Exactly one of LexV2Bot or LexBot must be specified")
+        elif block_type == "DisconnectParticipant":
+            if conditions:
+                error("DisconnectParticipant does not support conditions")
+
+    @classmethod
+    def _validate_get_participant_input(cls, params: Dict[str, Any], conditions: list, error):
+        """Rules from the GetParticipantInput block documentation."""
+        if "InputTimeLimitSeconds" not in params:
+            error("GetParticipantInput requires InputTimeLimitSeconds")
+
+        store_input = params.get("StoreInput", "False")
+        if store_input not in ("True", "False"):
+            error(f"StoreInput must be 'True' or 'False', got {store_input!r}")
+        elif store_input == "True" and conditions:
+            error("Conditions are not supported when StoreInput is True")
+
+        validation = params.get("InputValidation", {})
+        if validation:
+            has_phone = "PhoneNumberValidation" in validation
+            has_custom = "CustomValidation" in validation
+            if has_phone == has_custom:
+                error("InputValidation needs exactly one of PhoneNumberValidation or CustomValidation")
+            phone = validation.get("PhoneNumberValidation", {})
+            if phone.get("NumberFormat") == "Local" and not phone.get("CountryCode"):
+                error("PhoneNumberValidation with NumberFormat Local requires CountryCode")
+
+        if "InputEncryption" in params and "CustomValidation" not in validation:
+            error("InputEncryption requires InputValidation.CustomValidation")
+
+    @classmethod
+    def validate_file(cls, filepath: str) -> List[ValidationIssue]:
+        """Load and validate a flow JSON file."""
+        with open(filepath, 'r') as f:
+            flow_json = json_backend.load(f)
+        return cls.validate(flow_json)
+
+
+def check_files(argv: List[str], check_file: Callable[[str], List[ValidationIssue]],
+                verdicts: Tuple[str, str] = ("Valid", "Invalid")) -> int:
+    """Command line entry point: check each file in argv[1:], print the issues, return the exit code."""
+    if len(argv) < 2:
+        print(f"Usage: {argv[0]} <flow_file.json> [...]")
+        return 1
+
+    passed, failed = verdicts
+    failed_count = 0
+    for filepath in argv[1:]:
+        try:
+            issues = check_file(filepath)
+        except (OSError, ValueError) as e:
+            issues = [ValidationIssue("error", f"Could not read flow: {e}")]
+
+        errors = [issue for issue in issues if issue.severity == "error"]
+        print(f"{'✗ ' + failed if errors else '✓ ' + passed}: {filepath}")
+        for issue in issues:
+            print(f"    {issue}")
+        if errors:
+            failed_count += 1
+
+    print(f"\nResults: {len(argv) - 1 - failed_count} {passed.lower()}, {failed_count} {failed.lower()}")
+    return 1 if failed_count else 0
+
+
+if __name__ == "__main__":
+    sys.exit(check_files(sys.argv, FlowValidator.validate_file))
@@ -5,15 +5,15 @@ import sys
 sys.path.insert(0, '../src')
 
 from flow_builder import ContactFlowBuilder
-import json
+from flow_manifest import FlowManifest
 from pathlib import Path
 
 
 def generate_counter_flow():
     """Generate a flow that invokes a counter Lambda and speaks the result."""
     
-    # Create the flow builder
-    flow = ContactFlowBuilder("Counter Flow")
+    # Create the flow builder (deterministic ids keep the JSON stable between runs)
+    flow = ContactFlowBuilder("Counter Flow", id_generator="deterministic")
     
     # Step 1: Welcome message (entry point)
     welcome = flow.play_prompt("Thank you for calling!")
@@ -62,21 +62,27 @@ def generate_counter_flow():
 
 
 def main():
-    """Generate the flow JSON file for Terraform deployment."""
+    """Generate the flow JSON file for Terraform deployment.
+
+    The file is only rewritten when the flow changed, so Terraform does not
+    see a new file on every run.
+    """
     
     print("Generating Counter Flow")
     print("="*60)
     
-    flow = generate_counter_flow()    
-    compiled = flow.compile()   
+    flow = generate_counter_flow()
     output_path = Path(__file__).parent / "counter_flow.json"
-    
-    with open(output_path, 'w') as f:
-        json.dump(compiled, f, indent=2)
-    
-    print(f"Flow generated: {output_path}")
-    print(f"Total blocks: {len(compiled['Actions'])}")
-    print("Next: cd terraform && terraform apply")
+    manifest = FlowManifest(Path(__file__).parent / ".flow_manifest.json")
+
+    written = flow.compile_to_file(str(output_path), manifest=manifest)
+    manifest.save()
+
+    print(f"Total blocks: {len(flow.blocks)}")
+    if written:
+        print("Next: cd terraform && terraform apply")
+    else:
+        print("Flow unchanged, nothing to deploy")
 
 
 if __name__ == "__main__":
@@ -1,11 +1,36 @@
 #!/bin/bash
 
 # Validate all flows in the output directory
-# Usage: ./validate_all_flows.sh
+# Usage: ./validate_all_flows.sh [--aws]
+#
+# Flows are checked offline with src/validator.py. With --aws, flows that
+# pass are also validated against Amazon Connect (create + delete round-trip).
 
 OUTPUT_DIR="./output"
+LOCAL_VALIDATOR="./src/validator.py"
 VALIDATOR="./validate_flow.sh"
 
+USE_AWS=0
+if [ "$1" == "--aws" ]; then
+    USE_AWS=1
+fi
+
+if [ ! -f "$LOCAL_VALIDATOR" ]; then
+    echo "Error: Local validator not found"
+    exit 1
+fi
+
+total=$(find "$OUTPUT_DIR" -name "*.json" 2>/dev/null | wc -l | tr -d ' ')
+echo "Validating $total flows..."
+echo ""
+
+python3 "$LOCAL_VALIDATOR" "$OUTPUT_DIR"/*.json
+local_status=$?
+
+if [ $USE_AWS -eq 0 ]; then
+    exit $local_status
+fi
+
 if [ ! -f "$VALIDATOR" ]; then
     echo "Error: Validator script not found"
     exit 1
@@ -13,8 +38,8 @@ fi
 
 chmod +x "$VALIDATOR"
 
-total=$(find "$OUTPUT_DIR" -name "*.json" 2>/dev/null | wc -l | tr -d ' ')
-echo "Validating $total flows..."
+echo ""
+echo "Validating locally valid flows against Amazon Connect..."
 echo ""
 
 valid_count=0
@@ -22,14 +47,20 @@ invalid_count=0
 
 for flow_file in "$OUTPUT_DIR"/*.json; do
     if [ -f "$flow_file" ]; then
+        # Skip flows that already failed offline validation
+        if ! python3 "$LOCAL_VALIDATOR" "$flow_file" > /dev/null; then
+            invalid_count=$((invalid_count + 1))
+            continue
+        fi
+
         "$VALIDATOR" "$flow_file"
-        
+
         if [ $? -eq 0 ]; then
             valid_count=$((valid_count + 1))
         else
             invalid_count=$((invalid_count + 1))
         fi
-        
+
         sleep 1
     fi
 done